@@ -0,0 +1,64 @@
+import time
+from contextlib import contextmanager
+
+from admin.p8_query_budget.recorder import QueryRecorder
+
+
+class ServerTiming:
+    """
+    Collects the duration and query count of the named phases of a request.
+
+    Phases may be entered several times, e.g. `get_queryset` is called by the changelist and by its filters, their
+    durations and query counts are summed. Phases can nest, the `total` phase covers the whole view.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty collector and the recorder counting the queries of the request.
+        """
+        self.recorder = QueryRecorder()
+        #: Maps phase names to their accumulated duration in seconds, number of queries and number of calls.
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Measures the block as a run of the named phase.
+
+        Args:
+            - name (str): The phase name, it must be a valid HTTP token (no spaces or separators).
+        """
+        start, queries = time.perf_counter(), self.recorder.count
+        try:
+            yield
+        finally:
+            duration, count, calls = self.phases.get(name, (0.0, 0, 0))
+            self.phases[name] = (
+                duration + time.perf_counter() - start,
+                count + self.recorder.count - queries,
+                calls + 1,
+            )
+
+    def get_header(self) -> str:
+        """
+        Formats the phases as a `Server-Timing` header value.
+
+        Returns:
+            - str: One metric per phase with its duration in milliseconds and its query count as description.
+        """
+        return ', '.join(
+            f'{name};dur={duration * 1000:.1f};desc="{count} queries, {calls} calls"'
+            for name, (duration, count, calls) in self.phases.items()
+        )
+
+    def as_dict(self) -> dict:
+        """
+        Returns the phases as a serializable mapping, suited for structured logging.
+
+        Returns:
+            - dict: Maps phase names to their duration in milliseconds, number of queries and number of calls.
+        """
+        return {
+            name: {'ms': round(duration * 1000, 1), 'queries': count, 'calls': calls}
+            for name, (duration, count, calls) in self.phases.items()
+        }
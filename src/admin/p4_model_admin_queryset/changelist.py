@@ -0,0 +1,521 @@
+import copy
+import json
+import time
+import base64
+import datetime
+import threading
+from functools import partial, reduce
+from typing import List, Optional, Tuple
+
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.utils import get_fields_from_path, NotRelationField
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR
+from django.core.paginator import InvalidPage
+
+
+#: The query string parameter holding the cursor of the page following the current one.
+CURSOR_AFTER_VAR = 'after'
+#: The query string parameter holding the cursor of the page preceding the current one.
+CURSOR_BEFORE_VAR = 'before'
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    A JSON encoder keeping the microseconds of datetimes and times, which `DjangoJSONEncoder` truncates to milliseconds.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class QueryPlanChangeListMixin:
+    """
+    A mixin for Django admin `ChangeList` classes that applies the model admin's query plan.
+
+    The changelist builds its queryset from `ModelAdmin.get_queryset`, applies filters, search and ordering, and joins
+    relations through `get_list_select_related`. This mixin applies the remaining parts of the plan (prefetching and
+    column restriction) to the displayed result page only, so they affect neither the change form nor the queryset
+    passed to admin actions, which may read any field.
+    """
+
+    def get_results(self, request):
+        """
+        Fetches the current page from the queryset with the query plan applied.
+
+        Args:
+            - request: The HttpRequest object.
+        """
+        queryset = self.queryset
+        # Joins are already applied by the changelist through `get_list_select_related`
+        self.queryset = self.model_admin.get_query_plan(request).apply(queryset, select_related=False)
+        try:
+            super().get_results(request)
+        finally:
+            # Admin actions rebuild their queryset through `get_queryset`, which stays unplanned
+            self.queryset = queryset
+
+
+class EstimatedCountChangeListMixin:
+    """
+    A mixin for Django admin `ChangeList` classes that keeps the unfiltered total count off the full table scan.
+
+    When filters are active the changelist also counts the unfiltered queryset to display "(N total)". This mixin
+    computes that total through the model admin's paginator as well, so it is served from the estimate instead of a
+    `SELECT COUNT(*)` over the whole table, and displayed as such.
+
+    The base implementation trusts the count to decide whether the results fit a single page or can all be shown. When
+    the count isn't exact the page is fetched through the paginator instead, which finds out whether more rows follow.
+    """
+
+    def get_results(self, request):
+        """
+        Fetches the current page and computes the result counts through the model admin's paginator.
+
+        Args:
+            - request: The HttpRequest object.
+        """
+        root_paginator = None
+        root_queryset = self.root_queryset
+        if self.model_admin.show_full_result_count:
+            # Counting ignores the ordering, it only keeps the paginator from warning about unordered results
+            root_paginator = self.model_admin.get_paginator(request, root_queryset.order_by('pk'), self.list_per_page)
+            # The base implementation counts the root queryset exactly, answer it from the paginator instead
+            self.root_queryset = root_queryset._clone()
+            self.root_queryset.count = lambda: root_paginator.count
+        try:
+            super().get_results(request)
+        finally:
+            self.root_queryset = root_queryset
+        if root_paginator is not None and not root_paginator.count_is_exact:
+            # Rendered as "(~N total)" by the search form
+            self.full_result_count = root_paginator.count_display
+
+        if getattr(self.paginator, 'count_is_exact', True):
+            return
+        # The base implementation loads the whole queryset when the count seems to fit a single page
+        if (self.show_all and self.can_show_all) or not self.multi_page:
+            try:
+                self.result_list = self.paginator.page(self.page_num).object_list
+            except InvalidPage:
+                raise IncorrectLookupParameters
+        self.can_show_all = False
+        self.multi_page = self.paginator.num_pages > 1
+
+
+class KeysetChangeListMixin:
+    """
+    A mixin for Django admin `ChangeList` classes that pages through results with keyset (seek) pagination.
+
+    Instead of `OFFSET`, each page is fetched with a WHERE clause comparing the ordering columns to the values of the
+    last (or first) row of the previous page, with the primary key as a tiebreaker. With an index on the ordering
+    columns every page costs an index seek, however deep it is. The cursors are passed in the URL through the
+    `after` and `before` parameters and exposed as `next_page_url` and `previous_page_url`.
+
+    Keyset pagination requires every ordering column to be a non-nullable, non-relational field; for other orderings
+    the changelist falls back to regular page numbers.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        """
+        Extracts the cursors from the query string before the base implementation validates the lookup parameters.
+
+        Args:
+            - request: The HttpRequest object.
+            - *args: Variable length argument list passed to the base implementation.
+            - **kwargs: Arbitrary keyword arguments passed to the base implementation.
+        """
+        self.cursor_after = request.GET.get(CURSOR_AFTER_VAR)
+        self.cursor_before = None if self.cursor_after else request.GET.get(CURSOR_BEFORE_VAR)
+        self.has_next_page = self.has_previous_page = False
+        # Work on a copy, the cursors would otherwise be rejected as unknown filters
+        request = copy.copy(request)
+        request.GET = request.GET.copy()
+        request.GET.pop(CURSOR_AFTER_VAR, None)
+        request.GET.pop(CURSOR_BEFORE_VAR, None)
+        super().__init__(request, *args, **kwargs)
+
+    def get_keyset_fields(self) -> Optional[List[Tuple[str, bool]]]:
+        """
+        Returns the ordering columns used as the keyset, ending with the primary key.
+
+        Returns:
+            - list or None: Pairs of field path and descending flag, or None if the ordering can't be used as a keyset.
+        """
+        keyset = []
+        for item in self.queryset.query.order_by:
+            if isinstance(item, str) and item != '?':
+                name, descending = item.lstrip('-'), item.startswith('-')
+            elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+                name, descending = item.expression.name, item.descending
+            else:
+                return None
+            if any(name == seen for seen, _ in keyset):
+                # Repeated columns don't narrow the ordering any further
+                continue
+            if name in ('pk', self.opts.pk.name):
+                keyset.append(('pk', descending))
+                return keyset
+            try:
+                field = get_fields_from_path(self.model, name)[-1]
+            except (FieldDoesNotExist, NotRelationField):
+                return None
+            # NULLs don't compare and relations order by the related model's ordering
+            if field.is_relation or field.null:
+                return None
+            keyset.append((name, descending))
+        # The primary key breaks ties, following the direction of the last column
+        keyset.append(('pk', keyset[-1][1] if keyset else False))
+        return keyset
+
+    def get_keyset_field(self, name: str):
+        """
+        Returns the model field of a keyset column.
+
+        Args:
+            - name (str): The field path of the column, or `pk`.
+
+        Returns:
+            - Field: The field the column values belong to.
+        """
+        if name == 'pk':
+            return self.opts.pk
+        return get_fields_from_path(self.model, name)[-1]
+
+    def encode_cursor(self, values: list) -> str:
+        """
+        Encodes the keyset values of a row into an opaque URL-safe cursor, without losing precision.
+
+        Args:
+            - values (list): The values of the keyset columns.
+
+        Returns:
+            - str: The cursor.
+        """
+        return base64.urlsafe_b64encode(json.dumps(values, cls=CursorJSONEncoder).encode()).decode()
+
+    def decode_cursor(self, cursor: str, keyset: List[Tuple[str, bool]]) -> list:
+        """
+        Decodes a cursor back into the keyset values it was built from, converted by their fields.
+
+        Args:
+            - cursor (str): The cursor from the query string.
+            - keyset (list): The keyset the cursor must match.
+
+        Returns:
+            - list: The values of the keyset columns.
+
+        Raises:
+            - IncorrectLookupParameters: If the cursor is malformed or doesn't match the keyset.
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except ValueError:
+            raise IncorrectLookupParameters
+        if not isinstance(values, list) or len(values) != len(keyset):
+            raise IncorrectLookupParameters
+        try:
+            return [self.get_keyset_field(name).to_python(value) for (name, _), value in zip(keyset, values)]
+        except ValidationError:
+            raise IncorrectLookupParameters
+
+    def get_seek_filter(self, keyset: List[Tuple[str, bool]], values: list, forward: bool) -> Q:
+        """
+        Builds the WHERE clause selecting the rows after (or before) a cursor.
+
+        For a keyset `(a, b, pk)` seeking forward in ascending order this is
+        `a > x OR (a = x AND b > y) OR (a = x AND b = y AND pk > z)`.
+
+        Args:
+            - keyset (list): Pairs of field path and descending flag.
+            - values (list): The cursor values of the keyset columns.
+            - forward (bool): True to select the rows after the cursor, False for the rows before it.
+
+        Returns:
+            - Q: The seek condition.
+        """
+        conditions = []
+        for index, (name, descending) in enumerate(keyset):
+            lookup = 'gt' if descending != forward else 'lt'
+            equal = {prefix: value for (prefix, _), value in zip(keyset[:index], values)}
+            conditions.append(Q(**equal, **{f'{name}__{lookup}': values[index]}))
+        return reduce(lambda left, right: left | right, conditions)
+
+    def get_results(self, request):
+        """
+        Fetches the current page by seeking from the cursor instead of using an offset.
+
+        Args:
+            - request: The HttpRequest object.
+        """
+        keyset = self.get_keyset_fields()
+        if keyset is not None:
+            # Page numbers are meaningless with cursors, validate the first page only
+            self.page_num = 1
+        super().get_results(request)
+        if keyset is None or (self.show_all and self.can_show_all):
+            return
+
+        ordering = [('-' if descending else '') + name for name, descending in keyset]
+        queryset = self.queryset.order_by(*ordering)
+        forward = self.cursor_before is None
+        cursor = self.cursor_after or self.cursor_before
+        seek = queryset
+        if cursor:
+            seek = seek.filter(self.get_seek_filter(keyset, self.decode_cursor(cursor, keyset), forward))
+        if not forward:
+            # Walk backwards from the cursor, then restore the display order
+            seek = seek.reverse()
+
+        # Fetch one extra key to know if there is another page in the walking direction
+        pks = list(seek.values_list('pk', flat=True)[:self.list_per_page + 1])
+        has_more = len(pks) > self.list_per_page
+        pks = pks[:self.list_per_page]
+        if forward:
+            self.has_next_page, self.has_previous_page = has_more, bool(cursor)
+        else:
+            self.has_next_page, self.has_previous_page = True, has_more
+
+        # Annotate the keyset values so the cursors of the page are read without touching relations
+        self.keyset_annotations = {f'_keyset_{index}': F(name) for index, (name, _) in enumerate(keyset)}
+        self.result_list = queryset.filter(pk__in=pks).annotate(**self.keyset_annotations)
+        self.multi_page = self.has_next_page or self.has_previous_page
+
+    def get_row_cursor(self, obj) -> str:
+        """
+        Returns the cursor pointing at a row of the current page.
+
+        Args:
+            - obj (Model instance): A row of the current page.
+
+        Returns:
+            - str: The cursor built from the row's keyset values.
+        """
+        return self.encode_cursor([getattr(obj, name) for name in self.keyset_annotations])
+
+    @property
+    def next_page_url(self) -> Optional[str]:
+        """
+        Returns the URL of the next page, or None on the last page.
+
+        Returns:
+            - str or None: The query string of the next page.
+        """
+        if not self.has_next_page:
+            return None
+        rows = list(self.result_list)
+        if not rows:
+            return None
+        return self.get_query_string({CURSOR_AFTER_VAR: self.get_row_cursor(rows[-1])}, [PAGE_VAR])
+
+    @property
+    def previous_page_url(self) -> Optional[str]:
+        """
+        Returns the URL of the previous page, or None on the first page.
+
+        Returns:
+            - str or None: The query string of the previous page.
+        """
+        if not self.has_previous_page:
+            return None
+        rows = list(self.result_list)
+        if not rows:
+            return None
+        return self.get_query_string({CURSOR_BEFORE_VAR: self.get_row_cursor(rows[0])}, [PAGE_VAR])
+
+
+class ResultCacheChangeListMixin:
+    """
+    A mixin for Django admin `ChangeList` classes that caches the result page of a changelist.
+
+    The cache stores the counts and the primary keys of the page, keyed by the model admin's result cache key (model
+    version, normalized query parameters, page and permission scope). On a hit neither the filtered count nor the
+    filtered, sorted scan run again: the page is loaded by primary key.
+    """
+    #: The ChangeList attributes computed by `get_results` which are restored from the cache.
+    cached_attributes = (
+        'result_count', 'full_result_count', 'show_full_result_count', 'show_admin_actions', 'can_show_all',
+        'multi_page',
+    )
+    #: The paginator attributes restored from the cache when the paginator has them, e.g. whether the count is exact.
+    cached_paginator_attributes = ('count_is_exact', 'count_is_many', 'known_pages', 'last_page')
+
+    def get_results(self, request):
+        """
+        Restores the current page from the cache, or computes and caches it.
+
+        Args:
+            - request: The HttpRequest object.
+        """
+        cache = self.model_admin.get_result_cache()
+        key = self.model_admin.get_result_cache_key(request, self)
+        cached = cache.get(key)
+        if cached is None:
+            super().get_results(request)
+            cached = {name: getattr(self, name) for name in self.cached_attributes}
+            cached['paginator'] = {
+                name: getattr(self.paginator, name) for name in self.cached_paginator_attributes
+                if hasattr(self.paginator, name)
+            }
+            # Evaluating the page here is free, the queryset keeps its results for the template
+            cached['pks'] = [obj.pk for obj in self.result_list]
+            cache.set(key, cached, self.model_admin.result_cache_timeout)
+            return
+
+        for name in self.cached_attributes:
+            setattr(self, name, cached[name])
+        self.result_list = self.queryset.filter(pk__in=cached['pks'])
+        self.paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        # Seed the paginator's count so the page links don't count again
+        self.paginator.count = self.result_count
+        for name, value in cached['paginator'].items():
+            setattr(self.paginator, name, value)
+
+
+class FacetCacheChangeListMixin:
+    """
+    A mixin for Django admin `ChangeList` classes that computes the `list_filter` facet counts together and caches them.
+
+    Django runs one aggregate query per filter to count its choices. Filters whose parameters are not active all count
+    over the same queryset, so this mixin merges their counts into a single aggregate; only each active filter needs its
+    own. The counts are cached per model version and active filter set. Once older than the model admin's
+    `facet_cache_ttl` they are still served, while a background thread computes fresh ones.
+    """
+
+    def get_queryset(self, request, *args, **kwargs):
+        """
+        Returns the changelist queryset, and routes the facet counts of the filters through the cache.
+
+        Args:
+            - request: The HttpRequest object.
+            - *args: Variable length argument list passed to the base implementation.
+            - **kwargs: Arbitrary keyword arguments passed to the base implementation.
+
+        Returns:
+            - QuerySet[Model]: The filtered, searched and ordered queryset.
+        """
+        queryset = super().get_queryset(request, *args, **kwargs)
+        # Only the main queryset builds the filters rendered in the sidebar, facet querysets exclude some parameters
+        if not args and kwargs.get('exclude_parameters') is None:
+            self.facet_specs = [spec for spec in self.filter_specs if hasattr(spec, 'get_facet_counts')]
+            self.facet_counts = None
+            for spec in self.facet_specs:
+                spec.get_facet_queryset = partial(self.get_spec_facet_counts, request, spec)
+        return queryset
+
+    def get_spec_facet_counts(self, request, spec, changelist=None) -> dict:
+        """
+        Returns the facet counts of a filter, the replacement of its `get_facet_queryset`.
+
+        Args:
+            - request: The HttpRequest object.
+            - spec (ListFilter): The filter whose counts are requested.
+            - changelist (ChangeList, optional): The changelist, passed by the filter and ignored.
+
+        Returns:
+            - dict: The aggregated counts of the filter's choices.
+        """
+        if self.facet_counts is None:
+            self.facet_counts = self.get_cached_facet_counts(request)
+        return self.facet_counts[self.facet_specs.index(spec)]
+
+    def get_facet_cache_key(self, request) -> str:
+        """
+        Returns the cache key of the facet counts of the active filter set.
+
+        Args:
+            - request: The HttpRequest object.
+
+        Returns:
+            - str: The cache key.
+        """
+        params = {name: value for name, value in self.params.items() if name not in (ORDER_VAR, PAGE_VAR)}
+        return self.model_admin.make_result_cache_key(request, 'changelist-facets', params)
+
+    def get_cached_facet_counts(self, request) -> list:
+        """
+        Returns the facet counts from the cache, computing them on a miss and refreshing them once stale.
+
+        Args:
+            - request: The HttpRequest object.
+
+        Returns:
+            - list: The counts of each filter, in the order of `facet_specs`.
+        """
+        cache = self.model_admin.get_result_cache()
+        key = self.get_facet_cache_key(request)
+        cached = cache.get(key)
+        if cached is None:
+            facet_counts = self.compute_facet_counts(request)
+            cache.set(key, {'counts': facet_counts, 'time': time.time()}, self.model_admin.facet_cache_timeout)
+            return facet_counts
+        # A short-lived lock ensures a single process refreshes stale counts
+        if time.time() - cached['time'] > self.model_admin.facet_cache_ttl and cache.add(f'{key}:refresh', 1, 60):
+            threading.Thread(target=self.refresh_facet_counts, args=(request, key), daemon=True).start()
+        return cached['counts']
+
+    def refresh_facet_counts(self, request, key: str) -> None:
+        """
+        Computes fresh facet counts in a background thread, on a changelist of its own.
+
+        Args:
+            - request: The HttpRequest object.
+            - key (str): The cache key of the counts.
+        """
+        try:
+            changelist = self.model_admin.get_changelist_instance(request)
+            facet_counts = changelist.compute_facet_counts(request)
+            self.model_admin.get_result_cache().set(
+                key, {'counts': facet_counts, 'time': time.time()}, self.model_admin.facet_cache_timeout
+            )
+        finally:
+            # Threads open their own database connections
+            connections.close_all()
+
+    def compute_facet_counts(self, request) -> list:
+        """
+        Computes the facet counts of every filter in as few aggregate queries as possible.
+
+        Inactive filters count over the same queryset and share a single aggregate, each active filter counts over the
+        queryset without its own parameters.
+
+        Args:
+            - request: The HttpRequest object.
+
+        Returns:
+            - list: The counts of each filter, in the order of `facet_specs`.
+        """
+        groups = {}
+        for index, spec in enumerate(self.facet_specs):
+            expected = spec.expected_parameters()
+            active = any(parameter in self.params for parameter in expected)
+            groups.setdefault(tuple(expected) if active else None, []).append(index)
+
+        # Facet querysets rebuild the filters, keep the ones rendered in the sidebar
+        state = self.filter_specs, self.has_filters, self.has_active_filters
+        facet_counts = [None] * len(self.facet_specs)
+        try:
+            for expected, indexes in groups.items():
+                if expected is None:
+                    # None of these parameters is in the query string, excluding them doesn't change the queryset
+                    expected = [name for index in indexes for name in self.facet_specs[index].expected_parameters()]
+                queryset = self.get_queryset(request, exclude_parameters=list(expected))
+                aggregates = {}
+                for index in indexes:
+                    counts = self.facet_specs[index].get_facet_counts(self.pk_attname, queryset)
+                    aggregates.update({f'f{index}_{name}': count for name, count in counts.items()})
+                results = queryset.aggregate(**aggregates) if aggregates else {}
+                for index in indexes:
+                    prefix = f'f{index}_'
+                    facet_counts[index] = {
+                        name[len(prefix):]: value for name, value in results.items() if name.startswith(prefix)
+                    }
+        finally:
+            self.filter_specs, self.has_filters, self.has_active_filters = state
+        return facet_counts
@@ -1,10 +1,67 @@
+import hashlib
+import logging
+
+from django.core.cache import caches
+
+from .planner import QueryPlan, QueryPlanner
+from .paginators import EstimatedCountPaginator
+from .versions import get_models_version, track_model_version
+from .changelist import (QueryPlanChangeListMixin, EstimatedCountChangeListMixin, KeysetChangeListMixin,
+                         ResultCacheChangeListMixin, FacetCacheChangeListMixin)
+
+
+logger = logging.getLogger(__name__)
+
 
 class QuerysetAdminMixin:
     """
     A mixin for Django admin classes to customize the queryset used in the admin view.
     It allows specifying a custom queryset or uses the default manager's queryset.
+
+    Optionally, a query planner derives `select_related`, `prefetch_related` and `only()` / `defer()` for the
+    changelist from `list_display`, `list_filter` and `search_fields`, avoiding one query per row for each displayed
+    relation and the loading of wide columns that are never shown. An estimated-count paginator can also replace the
+    `SELECT COUNT(*)` run on every changelist page view, and keyset pagination can replace `OFFSET` so deep pages cost
+    an index seek. Result pages and filter facet counts can be cached until a row of the model is saved or deleted.
     """
     queryset = None
+    #: Whether the changelist queryset is optimized by the query planner.
+    use_query_planner = False
+    #: The class used to derive the changelist query plan.
+    query_planner_class = QueryPlanner
+    #: Whether the changelist counts rows through the estimated-count paginator.
+    use_estimated_count = False
+    #: The paginator class used when `use_estimated_count` is enabled.
+    estimated_count_paginator_class = EstimatedCountPaginator
+    #: Whether the changelist pages with keyset (seek) cursors instead of page numbers.
+    use_keyset_pagination = False
+    #: Whether changelist result pages are cached until the model changes.
+    use_result_cache = False
+    #: The cache alias storing result pages, preferably a bounded local-memory or file-based cache.
+    result_cache_alias = 'default'
+    #: How long, in seconds, a cached result page is reused at most.
+    result_cache_timeout = 300
+    #: Additional models whose changes invalidate the cached pages and facets, e.g. models used in filters or search.
+    result_cache_dependencies = ()
+    #: Whether the facet counts of `list_filter` are computed together and cached until the model changes.
+    use_facet_cache = False
+    #: The age, in seconds, after which cached facet counts are refreshed in the background.
+    facet_cache_ttl = 60
+    #: How long, in seconds, facet counts are kept in the cache at most.
+    facet_cache_timeout = 3600
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the admin and starts tracking the versions of the models the cached pages and facets depend on.
+
+        Args:
+            - *args: Variable length argument list passed to the superclass.
+            - **kwargs: Arbitrary keyword arguments passed to the superclass.
+        """
+        super().__init__(*args, **kwargs)
+        if self.use_result_cache or self.use_facet_cache:
+            for model in self.get_result_cache_models():
+                track_model_version(model)
 
     def get_queryset(self, request):
         """
@@ -29,3 +86,179 @@ class QuerysetAdminMixin:
             # Apply the ordering to the queryset if any ordering is specified
             qs = qs.order_by(*ordering)
         return qs
+
+    def get_query_plan(self, request) -> QueryPlan:
+        """
+        Returns the query plan applied to the changelist queryset.
+
+        This is the override hook for the planner: return a hand-built `QueryPlan` to replace the derived one. The
+        plan is computed once per request and logged at debug level, so the chosen strategy can be inspected.
+
+        Args:
+            - request: The HttpRequest object.
+
+        Returns:
+            - QueryPlan: The plan to apply to the changelist queryset.
+        """
+        # Memoize on the request, the admin instance is shared between threads
+        plans = request.__dict__.setdefault('_query_plans', {})
+        if self.opts.label not in plans:
+            plan = self.query_planner_class(self, request).plan()
+            logger.debug('Query plan for %s changelist:\n%s', self.opts.label, plan.report())
+            plans[self.opts.label] = plan
+        return plans[self.opts.label]
+
+    def get_list_select_related(self, request):
+        """
+        Returns the relations joined by the changelist, taken from the query plan when the planner is enabled.
+
+        Args:
+            - request: The HttpRequest object.
+
+        Returns:
+            - bool or tuple: The value used by the changelist to call `select_related`.
+        """
+        if not self.use_query_planner or self.list_select_related is True:
+            return super().get_list_select_related(request)
+        return self.get_query_plan(request).select_related
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        """
+        Returns the paginator of the changelist, the estimated-count paginator when it is enabled.
+
+        Args:
+            - request: The HttpRequest object.
+            - queryset (QuerySet): The queryset to paginate.
+            - per_page (int): The number of objects per page.
+            - orphans (int, optional): The minimum number of objects on the last page. Defaults to 0.
+            - allow_empty_first_page (bool, optional): Whether the first page may be empty. Defaults to True.
+
+        Returns:
+            - Paginator: The paginator instance.
+        """
+        if not self.use_estimated_count:
+            return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+        return self.estimated_count_paginator_class(queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_result_cache(self):
+        """
+        Returns the cache storing the changelist result pages and facet counts.
+
+        Returns:
+            - BaseCache: The cache backend.
+        """
+        return caches[self.result_cache_alias]
+
+    def get_result_cache_models(self) -> tuple:
+        """
+        Returns the models whose changes invalidate the cached result pages and facet counts.
+
+        Returns:
+            - tuple: The admin's model followed by `result_cache_dependencies`.
+        """
+        return (self.model, *self.result_cache_dependencies)
+
+    def get_result_cache_scope(self, request) -> str:
+        """
+        Returns the permission scope of the current user, users sharing a scope share the cached pages.
+
+        Override this method to return e.g. the user's primary key when `get_queryset` filters rows per user.
+
+        Args:
+            - request: The HttpRequest object.
+
+        Returns:
+            - str: The scope identifier.
+        """
+        if request.user.is_superuser:
+            return 'superuser'
+        permissions = sorted(
+            permission for permission in request.user.get_all_permissions()
+            if permission.startswith(f'{self.opts.app_label}.')
+        )
+        return ','.join(permissions)
+
+    def make_result_cache_key(self, request, prefix: str, params: dict, *parts: str) -> str:
+        """
+        Builds a cache key scoped to the model versions and the user's permission scope.
+
+        Args:
+            - request: The HttpRequest object.
+            - prefix (str): The prefix naming the cached value.
+            - params (dict): The query parameters the cached value depends on.
+            - *parts (str): Additional values the cached value depends on.
+
+        Returns:
+            - str: The cache key.
+        """
+        parts = [
+            repr(sorted((name, str(value)) for name, value in params.items())),
+            *parts,
+            self.get_result_cache_scope(request),
+            # Saving or deleting a row changes the version, which orphans every cached value
+            get_models_version(self.get_result_cache_models()),
+        ]
+        digest = hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+        return f'{prefix}:{self.opts.label_lower}:{digest}'
+
+    def get_result_cache_key(self, request, changelist) -> str:
+        """
+        Builds the cache key of the current result page.
+
+        Args:
+            - request: The HttpRequest object.
+            - changelist (ChangeList): The changelist being rendered.
+
+        Returns:
+            - str: The cache key.
+        """
+        # ChangeList.params holds the filter, search and ordering parameters without the page number
+        return self.make_result_cache_key(
+            request,
+            'changelist-page',
+            changelist.params,
+            str(changelist.page_num),
+            str(changelist.show_all),
+            str(changelist.list_per_page),
+        )
+
+    def get_changelist_mixins(self, request) -> tuple:
+        """
+        Returns the ChangeList mixins matching the enabled optimizations.
+
+        Args:
+            - request: The HttpRequest object.
+
+        Returns:
+            - tuple: The mixin classes to combine with the base ChangeList class.
+        """
+        mixins = ()
+        if self.use_query_planner:
+            mixins += (QueryPlanChangeListMixin,)
+        if self.use_keyset_pagination:
+            mixins += (KeysetChangeListMixin,)
+        if self.use_result_cache:
+            mixins += (ResultCacheChangeListMixin,)
+        # Inside the result cache, which then stores the pages fetched past an estimated count
+        if self.use_estimated_count:
+            mixins += (EstimatedCountChangeListMixin,)
+        if self.use_facet_cache:
+            mixins += (FacetCacheChangeListMixin,)
+        return mixins
+
+    def get_changelist(self, request, **kwargs):
+        """
+        Returns the changelist class, extended with the mixins of the enabled optimizations.
+
+        Args:
+            - request: The HttpRequest object.
+            - **kwargs: Arbitrary keyword arguments passed to the base implementation.
+
+        Returns:
+            - type: The ChangeList class used to render the changelist.
+        """
+        changelist_class = super().get_changelist(request, **kwargs)
+        mixins = self.get_changelist_mixins(request)
+        if not mixins:
+            return changelist_class
+        return type(changelist_class.__name__, (*mixins, changelist_class), {})
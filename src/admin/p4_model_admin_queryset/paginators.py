@@ -0,0 +1,260 @@
+import time
+from contextlib import contextmanager
+from math import ceil
+from typing import Optional
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections, transaction, DatabaseError
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+
+@contextmanager
+def time_limit(using: str, seconds: float):
+    """
+    Aborts the queries run inside the block once they exceed a time budget.
+
+    PostgreSQL enforces the budget server side through `statement_timeout`, SQLite through a progress handler that
+    interrupts the running statement. On other backends the block runs unbounded, the caller should still cap the
+    amount of work (e.g. with a LIMIT) to keep it cheap.
+
+    Args:
+        - using (str): The database alias the queries run on.
+        - seconds (float): The time budget in seconds.
+
+    Raises:
+        - DatabaseError: If a query is aborted because it exceeded the budget.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with transaction.atomic(using=using):
+            with connection.cursor() as cursor:
+                # SET LOCAL only lasts until the end of the surrounding transaction (the savepoint)
+                cursor.execute('SET LOCAL statement_timeout = %d' % int(seconds * 1000))
+            yield
+    elif connection.vendor == 'sqlite':
+        connection.ensure_connection()
+        deadline = time.monotonic() + seconds
+        # A non-zero return value interrupts the statement with an OperationalError
+        connection.connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        try:
+            yield
+        finally:
+            connection.connection.set_progress_handler(None, 0)
+    else:
+        yield
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A paginator that avoids running `SELECT COUNT(*)` over huge tables.
+
+    When the queryset is not filtered the row count is read from the backend statistics (PostgreSQL `reltuples`,
+    SQLite `sqlite_stat1`), or from a periodically refreshed cached count when no statistics are available. When the
+    queryset is filtered an exact count is run, capped at `count_threshold` rows and bounded by `count_timeout`
+    seconds; past either limit the count falls back to "many".
+
+    An estimate never bounds the pages: each page fetches one extra row to know whether a next page exists, and
+    `num_pages` grows past the estimate as pages are found, or stops at the last page once it is reached.
+    """
+    #: The number of rows past which an exact count is no longer computed.
+    count_threshold = 10000
+    #: The time budget, in seconds, of an exact count.
+    count_timeout = 0.2
+    #: How long, in seconds, the cached count of an unfiltered table is reused.
+    cache_timeout = 300
+    #: The label displayed instead of the count once the threshold is exceeded.
+    many_label = _('many')
+
+    #: Whether `count` is an exact figure, set when the count is computed.
+    count_is_exact = True
+    #: Whether the exact count was abandoned past the threshold or the time budget.
+    count_is_many = False
+    #: The highest page number known to exist when the count is not exact.
+    known_pages = 0
+    #: The number of the last page once it was fetched, when the count is not exact.
+    last_page = None
+
+    @cached_property
+    def count(self) -> int:
+        """
+        Returns the exact or estimated number of objects.
+
+        Returns:
+            - int: The number of objects, an estimate when `count_is_exact` is False.
+        """
+        if not hasattr(self.object_list, 'query'):
+            # Plain sequences are cheap to count
+            return super().count
+        if self.object_list.query.where or self.object_list.query.is_sliced or self.object_list.query.distinct:
+            return self.get_filtered_count()
+        estimate = self.get_estimated_count()
+        if estimate is None:
+            estimate = self.get_cached_count()
+        self.count_is_exact = False
+        return estimate
+
+    @property
+    def count_display(self) -> str:
+        """
+        Returns the count formatted for display, marking estimates as such.
+
+        Returns:
+            - str: The exact count, an approximate count prefixed with `~`, or the "many" label.
+        """
+        if self.count_is_exact:
+            return str(self.count)
+        if self.count_is_many:
+            return str(self.many_label)
+        return f'~{self.count}'
+
+    @property
+    def num_pages(self) -> int:
+        """
+        Returns the number of pages, as far as is known when the count is not exact.
+
+        Returns:
+            - int: The exact number of pages, or the estimated one raised to the pages found so far.
+        """
+        # Computing the count tells whether it is exact
+        count = self.count
+        if self.count_is_exact:
+            return super().num_pages
+        if self.last_page is not None:
+            return self.last_page
+        return max(ceil(count / self.per_page), self.known_pages, 1)
+
+    def validate_number(self, number) -> int:
+        """
+        Validates a 1-based page number, only bounded by the number of pages when the count is exact.
+
+        Args:
+            - number: The page number.
+
+        Returns:
+            - int: The page number.
+
+        Raises:
+            - PageNotAnInteger: If the number is not an integer.
+            - EmptyPage: If the number is lower than 1, or past the last page of an exact count.
+        """
+        # Computing the count tells whether it is exact
+        if self.count is not None and self.count_is_exact:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        """
+        Returns a page, fetching one extra row to find out whether it is the last one when the count is not exact.
+
+        Args:
+            - number: The 1-based page number.
+
+        Returns:
+            - Page: The page.
+
+        Raises:
+            - EmptyPage: If the page has no rows, past the first one.
+        """
+        number = self.validate_number(number)
+        if self.count_is_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        if len(rows) > self.per_page:
+            self.known_pages = max(self.known_pages, number + 1)
+        else:
+            self.last_page = number
+        return self._get_page(rows[:self.per_page], number, self)
+
+    @property
+    def using(self) -> str:
+        """
+        Returns the database alias the counted queryset reads from.
+
+        Returns:
+            - str: The database alias.
+        """
+        return self.object_list.db
+
+    def get_filtered_count(self) -> int:
+        """
+        Counts a filtered queryset exactly, up to `count_threshold` rows and within `count_timeout` seconds.
+
+        Returns:
+            - int: The exact count, or `count_threshold` if it is exceeded or the count runs out of time.
+        """
+        try:
+            with time_limit(self.using, self.count_timeout):
+                # Counting a LIMITed subquery stops scanning once the threshold is reached
+                count = self.object_list[:self.count_threshold + 1].count()
+        except DatabaseError:
+            count = self.count_threshold + 1
+        if count > self.count_threshold:
+            self.count_is_exact = False
+            self.count_is_many = True
+            return self.count_threshold
+        return count
+
+    def get_estimated_count(self) -> Optional[int]:
+        """
+        Reads the row count of the queryset's table from the backend statistics.
+
+        Returns:
+            - int or None: The estimated row count, or None if the backend has no usable statistics.
+        """
+        connection = connections[self.using]
+        table = self.object_list.model._meta.db_table
+        if connection.vendor == 'postgresql':
+            sql = 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass'
+            params = [connection.ops.quote_name(table)]
+        elif connection.vendor == 'sqlite':
+            # The first number of `stat` is the row count, present once ANALYZE has been run
+            sql = 'SELECT CAST(stat AS INTEGER) FROM sqlite_stat1 WHERE tbl = %s LIMIT 1'
+            params = [table]
+        else:
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+        except DatabaseError:
+            # sqlite_stat1 doesn't exist until the first ANALYZE
+            return None
+        # PostgreSQL reports -1 for tables that were never vacuumed or analyzed
+        if row is None or row[0] is None or row[0] < 0:
+            return None
+        return row[0]
+
+    def get_cache_key(self) -> str:
+        """
+        Returns the cache key of the periodic count for the queryset's table.
+
+        Returns:
+            - str: The cache key.
+        """
+        return f'estimated-count:{self.using}:{self.object_list.model._meta.db_table}'
+
+    def get_cached_count(self) -> int:
+        """
+        Returns the periodically refreshed count of the unfiltered table.
+
+        Returns:
+            - int: The cached row count.
+        """
+        count = cache.get(self.get_cache_key())
+        if count is None:
+            count = self.object_list.count()
+            cache.set(self.get_cache_key(), count, self.cache_timeout)
+        return count
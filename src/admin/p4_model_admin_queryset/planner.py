@@ -0,0 +1,248 @@
+from typing import Iterable, List, Tuple
+
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+from django.contrib.admin.utils import get_fields_from_path, NotRelationField
+from django.core.exceptions import FieldDoesNotExist
+
+
+#: Field classes considered "wide", they are deferred from the changelist unless they are displayed.
+WIDE_FIELD_CLASSES = (models.TextField, models.BinaryField, models.JSONField)
+
+
+class QueryPlan:
+    """
+    The set of loading strategies chosen for a changelist queryset.
+
+    A plan describes which relations are joined with `select_related`, which multi-valued relations are fetched with
+    `prefetch_related`, and which columns are loaded through either `only()` or `defer()`. It is a plain value object,
+    so it can be built by hand, returned from an override hook, or compared in tests.
+    """
+
+    def __init__(self, select_related: Iterable[str] = (), prefetch_related: Iterable[str] = (),
+                 only: Iterable[str] = (), defer: Iterable[str] = (), notes: Iterable[str] = ()) -> None:
+        """
+        Initializes the plan with the loading strategies to apply.
+
+        Args:
+            - select_related (Iterable[str]): Single-valued relation paths to join.
+            - prefetch_related (Iterable[str]): Multi-valued relation paths to prefetch.
+            - only (Iterable[str]): Field paths to load, every other concrete column is deferred.
+            - defer (Iterable[str]): Field paths to defer, ignored when `only` is given.
+            - notes (Iterable[str]): Human-readable explanations of the decisions taken by the planner.
+        """
+        self.select_related = tuple(dict.fromkeys(select_related))
+        self.prefetch_related = tuple(dict.fromkeys(prefetch_related))
+        self.only = tuple(dict.fromkeys(only))
+        self.defer = () if self.only else tuple(dict.fromkeys(defer))
+        self.notes = tuple(notes)
+
+    def apply(self, queryset: models.QuerySet, select_related: bool = True) -> models.QuerySet:
+        """
+        Applies the plan to a queryset.
+
+        Args:
+            - queryset (QuerySet): The queryset to optimize.
+            - select_related (bool): Whether to apply `select_related`, the changelist applies it on its own.
+
+        Returns:
+            - QuerySet: The optimized queryset.
+        """
+        if select_related and self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        elif self.defer:
+            queryset = queryset.defer(*self.defer)
+        return queryset
+
+    def report(self) -> str:
+        """
+        Builds a multi-line, human-readable description of the plan.
+
+        Returns:
+            - str: The plan report, suitable for debug logging.
+        """
+        lines = [
+            f'select_related: {", ".join(self.select_related) or "-"}',
+            f'prefetch_related: {", ".join(self.prefetch_related) or "-"}',
+            f'only: {", ".join(self.only) or "-"}',
+            f'defer: {", ".join(self.defer) or "-"}',
+        ]
+        lines.extend(f'note: {note}' for note in self.notes)
+        return '\n'.join(lines)
+
+    def __eq__(self, other: 'QueryPlan') -> bool:
+        """
+        Check equality between two QueryPlan instances.
+
+        Args:
+            - other: Another instance of QueryPlan.
+
+        Returns:
+            - bool: True if both plans apply the same strategies, otherwise False.
+        """
+        if not isinstance(other, QueryPlan):
+            return False
+        return (
+            self.select_related == other.select_related and
+            self.prefetch_related == other.prefetch_related and
+            self.only == other.only and
+            self.defer == other.defer
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f'<QueryPlan select_related={self.select_related!r} prefetch_related={self.prefetch_related!r} '
+            f'only={self.only!r} defer={self.defer!r}>'
+        )
+
+
+class QueryPlanner:
+    """
+    Derives a `QueryPlan` for a changelist from the admin's declarative options.
+
+    The planner walks `list_display` (and the editable / link columns) to find which columns and relations are
+    rendered. Single-valued relations become `select_related` joins, multi-valued ones become `prefetch_related`
+    lookups. When every displayed column resolves to a model field the planner can safely restrict the SELECT with
+    `only()`; as soon as a callable, admin method or model property is displayed it cannot know which attributes are
+    touched, so it falls back to deferring the wide columns (text, binary, JSON) that are not displayed.
+    `list_filter` and `search_fields` only influence the WHERE clause, they are inspected so the report explains the
+    joins they add without loading their columns.
+    """
+
+    def __init__(self, model_admin, request) -> None:
+        """
+        Initializes the planner for a model admin and the current request.
+
+        Args:
+            - model_admin (ModelAdmin): The admin whose changelist is planned.
+            - request (HttpRequest): The current request object.
+        """
+        self.model_admin = model_admin
+        self.request = request
+        self.model = model_admin.model
+        self.opts = self.model._meta
+
+    def resolve_path(self, name: str):
+        """
+        Resolves a list_display entry to a list of model fields.
+
+        Args:
+            - name (str): The entry to resolve, either a field name or a `__` separated path.
+
+        Returns:
+            - list or None: The fields traversed by the path, or None if the entry is not a model field path.
+        """
+        if not isinstance(name, str) or hasattr(self.model_admin, name):
+            return None
+        try:
+            return get_fields_from_path(self.model, name)
+        except (FieldDoesNotExist, NotRelationField):
+            return None
+
+    def split_relations(self, name: str, fields: list) -> Tuple[List[str], List[str]]:
+        """
+        Splits the relations traversed by a field path into joinable and prefetchable lookups.
+
+        Args:
+            - name (str): The original `__` separated path.
+            - fields (list): The fields traversed by the path as returned by `resolve_path`.
+
+        Returns:
+            - tuple: A pair of lists holding the `select_related` paths and the `prefetch_related` paths.
+        """
+        parts = name.split(LOOKUP_SEP)
+        select, prefetch = [], []
+        for index, field in enumerate(fields):
+            if not field.is_relation:
+                break
+            path = LOOKUP_SEP.join(parts[:index + 1])
+            if field.many_to_many or field.one_to_many:
+                # Everything below a multi-valued relation is loaded by the prefetch query
+                prefetch.append(path)
+                break
+            select.append(path)
+        return select, prefetch
+
+    def get_displayed_names(self) -> List:
+        """
+        Collects every entry the changelist renders for each row.
+
+        Returns:
+            - list: The list_display entries followed by the editable columns.
+        """
+        list_display = list(self.model_admin.get_list_display(self.request))
+        return list_display + [name for name in self.model_admin.list_editable if name not in list_display]
+
+    def get_where_paths(self) -> List[str]:
+        """
+        Collects the relation paths used only to filter or search the changelist.
+
+        Returns:
+            - list: The relation paths from `list_filter` and `search_fields`.
+        """
+        paths = []
+        for list_filter in self.model_admin.get_list_filter(self.request):
+            if isinstance(list_filter, (tuple, list)):
+                list_filter = list_filter[0]
+            if isinstance(list_filter, str):
+                paths.append(list_filter)
+        for search_field in self.model_admin.get_search_fields(self.request):
+            paths.append(search_field.lstrip('^=@'))
+        return [path for path in paths if LOOKUP_SEP in path]
+
+    def plan(self) -> QueryPlan:
+        """
+        Builds the query plan for the changelist.
+
+        Returns:
+            - QueryPlan: The derived plan.
+        """
+        select, prefetch, only, notes = [], [], [self.opts.pk.name], []
+        # Read the attribute, the mixin's get_list_select_related() is itself derived from the plan
+        list_select_related = self.model_admin.list_select_related
+        restrictable = list_select_related is not True
+
+        for name in self.get_displayed_names():
+            fields = self.resolve_path(name)
+            if fields is None:
+                # Callables, admin methods and properties may touch any attribute
+                restrictable = False
+                notes.append(f'{getattr(name, "__name__", name)!s} is not a field path, using defer()')
+                continue
+            joins, prefetches = self.split_relations(name, fields)
+            select.extend(joins)
+            prefetch.extend(prefetches)
+            if prefetches:
+                # The prefetch query loads the related rows, only the joined keys are needed locally
+                only.extend(joins)
+            else:
+                only.append(name)
+
+        # Explicitly configured joins are kept so existing admins don't lose them
+        if isinstance(list_select_related, (tuple, list)):
+            select.extend(list_select_related)
+            only.extend(list_select_related)
+
+        for path in dict.fromkeys(self.get_where_paths()):
+            notes.append(f'{path} only joins in the WHERE clause and is not loaded')
+
+        if restrictable:
+            # A displayed relation renders its __str__, so its row is loaded whole instead of column by column
+            relations = {path for path in only if path in select}
+            only = [
+                path for path in only
+                if not any(path.startswith(relation + LOOKUP_SEP) for relation in relations)
+            ]
+            # Ordering by a deferred column is fine, only keep fields needed to render the rows
+            return QueryPlan(select_related=select, prefetch_related=prefetch, only=only, notes=notes)
+
+        displayed = {name for name in self.get_displayed_names() if isinstance(name, str)}
+        defer = [
+            field.name for field in self.opts.concrete_fields
+            if isinstance(field, WIDE_FIELD_CLASSES) and field.name not in displayed
+        ]
+        return QueryPlan(select_related=select, prefetch_related=prefetch, defer=defer, notes=notes)
@@ -0,0 +1,113 @@
+import datetime
+import decimal
+import uuid
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import models
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+
+from models.p1_signal_enhanced.mixins import SignalEnhancedQuerySetMixins
+
+from .changelist import KeysetChangeListMixin
+from .mixins import QuerysetAdminMixin
+
+
+class CursorChangeList(KeysetChangeListMixin):
+    """
+    A keyset changelist reduced to its cursor methods, with standalone fields standing for the keyset columns.
+    """
+
+    def __init__(self, fields: dict) -> None:
+        self.fields = fields
+
+    def get_keyset_field(self, name: str):
+        return self.fields[name]
+
+
+class CursorRoundTripTests(SimpleTestCase):
+    """
+    Each type of ordering column must come back from a cursor unchanged, or the seek filter skips rows.
+    """
+
+    values = {
+        'datetime': (models.DateTimeField(), timezone.make_aware(datetime.datetime(2024, 5, 17, 10, 30, 15, 123456))),
+        'naive_datetime': (models.DateTimeField(), datetime.datetime(2024, 5, 17, 10, 30, 15, 123456)),
+        'date': (models.DateField(), datetime.date(2024, 5, 17)),
+        'time': (models.TimeField(), datetime.time(10, 30, 15, 123456)),
+        'duration': (models.DurationField(), datetime.timedelta(days=2, microseconds=123456)),
+        'decimal': (models.DecimalField(max_digits=20, decimal_places=10), decimal.Decimal('12345.0000000001')),
+        'float': (models.FloatField(), 0.1 + 0.2),
+        'integer': (models.BigIntegerField(), 2 ** 62 + 1),
+        'boolean': (models.BooleanField(), True),
+        'char': (models.CharField(max_length=20), 'ünïcode "quoted"'),
+        'uuid': (models.UUIDField(), uuid.UUID('12345678-1234-5678-1234-567812345678')),
+        'pk': (models.AutoField(primary_key=True), 42),
+    }
+
+    def test_round_trip(self):
+        for name, (field, value) in self.values.items():
+            with self.subTest(name):
+                changelist = CursorChangeList({name: field, 'pk': models.AutoField(primary_key=True)})
+                keyset = [(name, False), ('pk', False)]
+                cursor = changelist.encode_cursor([value, 7])
+                self.assertEqual(changelist.decode_cursor(cursor, keyset), [value, 7])
+
+
+class KeysetUserAdmin(QuerysetAdminMixin, admin.ModelAdmin):
+    use_keyset_pagination = True
+    ordering = ('-date_joined',)
+    list_display = ('username', 'date_joined')
+    list_per_page = 2
+
+
+class KeysetPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        joined = timezone.now() - datetime.timedelta(days=1)
+        for index in range(6):
+            User.objects.create(
+                username=f'user{index}', date_joined=joined + datetime.timedelta(microseconds=100 * index),
+            )
+
+    def test_pages_rows_apart_by_microseconds(self):
+        model_admin = KeysetUserAdmin(User, admin.AdminSite())
+        url, seen = '/', []
+        while url is not None:
+            request = RequestFactory().get(url)
+            request.user = self.superuser
+            changelist = model_admin.get_changelist_instance(request)
+            seen.extend(user.username for user in changelist.result_list)
+            url = changelist.next_page_url and '/' + changelist.next_page_url
+        self.assertEqual(seen, ['admin', 'user5', 'user4', 'user3', 'user2', 'user1', 'user0'])
+
+
+class SignalEnhancedUserQuerySet(SignalEnhancedQuerySetMixins, models.QuerySet):
+    #: Only the bulk signals are sent, so the cache must be invalidated by `post_bulk_create` alone.
+    send_row_signals = False
+
+
+class ResultCacheUserAdmin(QuerysetAdminMixin, admin.ModelAdmin):
+    use_result_cache = True
+    list_display = ('username',)
+
+
+class ResultCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def get_usernames(self, model_admin):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        return [user.username for user in model_admin.get_changelist_instance(request).result_list]
+
+    def test_bulk_create_invalidates_cached_pages(self):
+        model_admin = ResultCacheUserAdmin(User, admin.AdminSite())
+        self.assertEqual(self.get_usernames(model_admin), ['admin'])
+        SignalEnhancedUserQuerySet(User).bulk_create([User(username='bulk0'), User(username='bulk1')])
+        self.assertEqual(sorted(self.get_usernames(model_admin)), ['admin', 'bulk0', 'bulk1'])
@@ -0,0 +1,98 @@
+import uuid
+from typing import Iterable
+
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+
+from models.p1_signal_enhanced.signals import post_bulk_create, post_bulk_update, post_bulk_delete
+
+
+#: The cache alias holding the model version tokens, it must be shared by every process serving the admin.
+VERSION_CACHE_ALIAS = 'default'
+
+
+def get_version_cache_key(model) -> str:
+    """
+    Returns the cache key holding the version token of a model.
+
+    Args:
+        - model: The model class.
+
+    Returns:
+        - str: The cache key.
+    """
+    return f'model-version:{model._meta.label_lower}'
+
+
+def get_model_version(model) -> str:
+    """
+    Returns the current version token of a model, creating it on first access.
+
+    Args:
+        - model: The model class.
+
+    Returns:
+        - str: An opaque token that changes whenever a row of the model is saved or deleted.
+    """
+    cache = caches[VERSION_CACHE_ALIAS]
+    version = cache.get(get_version_cache_key(model))
+    if version is None:
+        version = uuid.uuid4().hex
+        # add() keeps the token of a concurrent first access
+        if not cache.add(get_version_cache_key(model), version, None):
+            version = cache.get(get_version_cache_key(model), version)
+    return version
+
+
+def get_models_version(models: Iterable) -> str:
+    """
+    Returns a version token combining the tokens of several models.
+
+    Args:
+        - models (Iterable): The model classes.
+
+    Returns:
+        - str: A token that changes whenever a row of any of the models is saved or deleted.
+    """
+    return '.'.join(get_model_version(model) for model in models)
+
+
+def bump_model_version(model) -> None:
+    """
+    Replaces the version token of a model, invalidating everything keyed by the previous token.
+
+    Args:
+        - model: The model class.
+    """
+    caches[VERSION_CACHE_ALIAS].set(get_version_cache_key(model), uuid.uuid4().hex, None)
+
+
+def bump_model_version_receiver(sender, **kwargs) -> None:
+    """
+    Signal receiver bumping the version of the sender model.
+
+    Args:
+        - sender: The model class sending the signal.
+        - **kwargs: The signal arguments.
+    """
+    bump_model_version(sender)
+
+
+def track_model_version(model) -> None:
+    """
+    Connects the receivers keeping the version token of a model up to date.
+
+    The receivers listen to `post_save` and `post_delete`, and to the `post_bulk_create`, `post_bulk_update` and
+    `post_bulk_delete` signals sent once per batch by `SignalEnhancedQuerySetMixins`. Connecting the same model several
+    times is a no-op.
+
+    Args:
+        - model: The model class to track.
+    """
+    for signal in (post_save, post_delete, post_bulk_create, post_bulk_update, post_bulk_delete):
+        signal.connect(
+            bump_model_version_receiver,
+            sender=model,
+            weak=False,
+            dispatch_uid=f'model-version:{model._meta.label_lower}',
+        )
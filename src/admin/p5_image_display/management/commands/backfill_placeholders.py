@@ -0,0 +1,79 @@
+from django.apps import apps
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+
+from admin.p5_image_display.mixins import ImageFieldDisplayAdminMixin
+
+
+class Command(BaseCommand):
+    help = (
+        'Computes the missing image placeholders of a model, for images saved before placeholders were enabled or '
+        'outside the admin.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='The model label, e.g. shop.Product.')
+        parser.add_argument('--batch-size', type=int, default=500, help='The number of rows loaded per query.')
+        parser.add_argument('--force', action='store_true', help='Recompute the placeholders already stored.')
+
+    def get_model_admin(self, model):
+        """
+        Returns the admin of a model, which computes and stores the placeholders.
+
+        Args:
+            - model: The model class.
+
+        Returns:
+            - ImageFieldDisplayAdminMixin: The registered admin.
+
+        Raises:
+            - CommandError: If the model isn't registered with an admin using `ImageFieldDisplayAdminMixin`.
+        """
+        model_admin = admin.site._registry.get(model)
+        if not isinstance(model_admin, ImageFieldDisplayAdminMixin):
+            raise CommandError(f'{model._meta.label} has no admin using ImageFieldDisplayAdminMixin.')
+        return model_admin
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as error:
+            raise CommandError(error)
+        model_admin = self.get_model_admin(model)
+
+        queryset = model._default_manager.exclude(image='').exclude(image__isnull=True).order_by('pk')
+        totals = [0, 0, 0]
+        for start in range(0, queryset.count(), options['batch_size']):
+            batch = list(queryset[start:start + options['batch_size']])
+            for index, count in enumerate(self.backfill(model_admin, batch, options['force'])):
+                totals[index] += count
+        computed, skipped, failed = totals
+
+        self.stdout.write(self.style.SUCCESS(f'Computed {computed} placeholders, {skipped} skipped, {failed} failed.'))
+
+    def backfill(self, model_admin, objs, force: bool):
+        """
+        Computes the placeholders of a batch of instances, reading the stored ones with a single lookup.
+
+        Args:
+            - model_admin (ImageFieldDisplayAdminMixin): The admin of the model.
+            - objs (list): The model instances having an image.
+            - force (bool): Whether the placeholders already stored are recomputed.
+
+        Returns:
+            - tuple: The number of computed, skipped and failed placeholders.
+        """
+        stored = {} if force else model_admin.get_image_placeholders(objs)
+        computed = skipped = failed = 0
+        for obj in objs:
+            if stored.get(obj.pk):
+                skipped += 1
+                continue
+            try:
+                model_admin.update_image_placeholder(obj)
+            except Exception as error:
+                failed += 1
+                self.stderr.write(f'{obj.image.name}: {error.__class__.__name__}: {error}')
+            else:
+                computed += 1
+        return computed, skipped, failed
@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+import django
+from django.apps import apps
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models.fields.files import FieldFile
+
+from admin.p5_image_display.mixins import ImageFieldDisplayAdminMixin
+from admin.p5_image_display.thumbnails import THUMBNAIL_FORMATS
+
+
+def warm_thumbnail(generator_class, model_label: str, field_name: str, name: str, sizes: Tuple, fmt: str):
+    """
+    Generates the thumbnails of one image, run in the worker processes.
+
+    Args:
+        - generator_class: The `ThumbnailGenerator` class producing the thumbnails.
+        - model_label (str): The label of the model holding the image, e.g. 'shop.Product'.
+        - field_name (str): The name of the image field.
+        - name (str): The storage name of the image.
+        - sizes (tuple): The maximum width and height of each thumbnail.
+        - fmt (str): The thumbnail format.
+
+    Returns:
+        - tuple: The image name and the error message, None when every thumbnail was generated.
+    """
+    field = apps.get_model(model_label)._meta.get_field(field_name)
+    field_file = FieldFile(None, field, name)
+    generator = generator_class()
+    try:
+        for size in sizes:
+            generator.get_thumbnail(field_file, size, fmt)
+    except Exception as error:
+        return name, f'{error.__class__.__name__}: {error}'
+    return name, None
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates the admin thumbnails of every image of a model in a process pool, so the first changelist views '
+        'after an upload batch are served from the thumbnail cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='The model label, e.g. shop.Product.')
+        parser.add_argument(
+            '--sizes',
+            help='Comma separated thumbnail size names. Defaults to every size of the model admin.',
+        )
+        parser.add_argument('--format', choices=THUMBNAIL_FORMATS, help='Defaults to the format of the model admin.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Defaults to the number of CPUs.')
+        parser.add_argument('--chunk-size', type=int, default=16, help='The number of images sent per task.')
+
+    def get_model_admin(self, model):
+        """
+        Returns the admin of a model, whose thumbnail settings are used.
+
+        Args:
+            - model: The model class.
+
+        Returns:
+            - ImageFieldDisplayAdminMixin: The registered admin.
+
+        Raises:
+            - CommandError: If the model isn't registered with an admin using `ImageFieldDisplayAdminMixin`.
+        """
+        model_admin = admin.site._registry.get(model)
+        if not isinstance(model_admin, ImageFieldDisplayAdminMixin):
+            raise CommandError(f'{model._meta.label} has no admin using ImageFieldDisplayAdminMixin.')
+        return model_admin
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as error:
+            raise CommandError(error)
+        model_admin = self.get_model_admin(model)
+
+        size_names = options['sizes'].split(',') if options['sizes'] else list(model_admin.thumbnail_sizes)
+        unknown = set(size_names) - set(model_admin.thumbnail_sizes)
+        if unknown:
+            raise CommandError(f'Unknown thumbnail sizes: {", ".join(sorted(unknown))}.')
+        sizes = tuple(model_admin.thumbnail_sizes[name] for name in size_names)
+        fmt = options['format'] or model_admin.thumbnail_format
+        generator_class = model_admin.thumbnail_generator_class
+
+        # The mixin displays the thumbnails of the `image` field only
+        field = 'image'
+        names = list(
+            model._default_manager.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+            .order_by().values_list(field, flat=True).distinct()
+        )
+        if not names:
+            self.stdout.write('No images to warm.')
+            return
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+
+        warmed = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as executor:
+            results = executor.map(
+                warm_thumbnail,
+                *zip(*((generator_class, model._meta.label, field, name, sizes, fmt) for name in names)),
+                chunksize=options['chunk_size'],
+            )
+            for name, error in results:
+                if error is None:
+                    warmed += 1
+                else:
+                    failed += 1
+                    self.stderr.write(f'{name}: {error}')
+
+        self.stdout.write(self.style.SUCCESS(f'Warmed {warmed} images, {failed} failed, {len(sizes)} sizes each.'))
@@ -0,0 +1,158 @@
+import hashlib
+import mimetypes
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.core.cache import caches
+from PIL import ExifTags, Image
+
+
+#: The cache alias holding the image metadata.
+METADATA_CACHE_ALIAS = 'default'
+#: How long the metadata of an image is kept, in seconds. Uploads get a new name, so entries only go stale when a file
+#: is overwritten in place.
+METADATA_CACHE_TIMEOUT = 60 * 60 * 24
+#: The EXIF orientations turning the image a quarter, which swaps its displayed width and height.
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def get_storage_key(storage) -> str:
+    """
+    Returns a stable identifier of a storage, so images with the same name in different storages don't collide.
+
+    Args:
+        - storage (Storage): The storage instance.
+
+    Returns:
+        - str: The storage class path and constructor arguments, hashed.
+    """
+    if hasattr(storage, 'deconstruct'):
+        path, args, kwargs = storage.deconstruct()
+        identity = repr((path, args, sorted(kwargs.items())))
+    else:
+        identity = f'{storage.__class__.__module__}.{storage.__class__.__qualname__}'
+    return hashlib.md5(identity.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def get_metadata_cache_key(storage, name: str) -> str:
+    """
+    Returns the cache key holding the metadata of an image.
+
+    Args:
+        - storage (Storage): The storage holding the image.
+        - name (str): The storage name of the image.
+
+    Returns:
+        - str: The cache key.
+    """
+    digest = hashlib.md5(name.encode(), usedforsecurity=False).hexdigest()
+    return f'image-metadata:{get_storage_key(storage)}:{digest}'
+
+
+def get_image_orientation(image) -> int:
+    """
+    Returns the EXIF orientation of an opened image, as found in its header.
+
+    Args:
+        - image (Image): The opened image.
+
+    Returns:
+        - int: The EXIF orientation, 1 when the image has none.
+    """
+    # PNG files may store their EXIF after the pixel data, reading it there would decode the whole image
+    if image.format == 'PNG' and 'exif' not in image.info:
+        return 1
+    return image.getexif().get(ExifTags.Base.Orientation, 1)
+
+
+def get_oriented_size(image) -> Tuple[int, int]:
+    """
+    Returns the dimensions of an opened image as displayed, once its EXIF orientation is applied.
+
+    Args:
+        - image (Image): The opened image.
+
+    Returns:
+        - tuple: The displayed width and height.
+    """
+    width, height = image.size
+    if get_image_orientation(image) in TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def read_image_metadata(field_file) -> Dict:
+    """
+    Reads the metadata of an image from its storage, only the image header is decoded.
+
+    Args:
+        - field_file (FieldFile): The image.
+
+    Returns:
+        - dict: The `url`, `width`, `height`, `content_type`, `size` and `mtime` (an ISO string or None) of the image.
+          The dimensions are the displayed ones, with the EXIF orientation applied, and they and the content type are
+          None when the file isn't a readable image.
+    """
+    storage, name = field_file.storage, field_file.name
+    metadata = {
+        'url': storage.url(name),
+        'width': None,
+        'height': None,
+        'content_type': mimetypes.guess_type(name)[0],
+        'size': None,
+        'mtime': None,
+    }
+    try:
+        metadata['size'] = storage.size(name)
+        metadata['mtime'] = storage.get_modified_time(name).isoformat()
+    except (NotImplementedError, OSError):
+        pass
+    try:
+        with storage.open(name, 'rb') as source:
+            image = Image.open(source)
+            metadata['width'], metadata['height'] = get_oriented_size(image)
+            metadata['content_type'] = Image.MIME.get(image.format, metadata['content_type'])
+    except (OSError, SyntaxError, ValueError):
+        pass
+    return metadata
+
+
+def get_images_metadata(field_files: Iterable) -> Dict[str, Dict]:
+    """
+    Returns the metadata of several images with one cache lookup, reading only the missing ones from storage.
+
+    Args:
+        - field_files (Iterable): The images, empty ones are ignored.
+
+    Returns:
+        - dict: Maps the storage names of the images to their metadata.
+    """
+    keys = {}
+    for field_file in field_files:
+        if field_file:
+            keys[get_metadata_cache_key(field_file.storage, field_file.name)] = field_file
+    cache = caches[METADATA_CACHE_ALIAS]
+    found = cache.get_many(keys)
+    missing = {key: read_image_metadata(field_file) for key, field_file in keys.items() if key not in found}
+    if missing:
+        cache.set_many(missing, METADATA_CACHE_TIMEOUT)
+    found.update(missing)
+    return {field_file.name: found[key] for key, field_file in keys.items()}
+
+
+def fit_size(width: Optional[int], height: Optional[int], box: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Returns the dimensions of an image scaled down to fit a box while keeping its aspect ratio, the exact size of the
+    thumbnails `ThumbnailGenerator` produces.
+
+    Args:
+        - width (int or None): The image width.
+        - height (int or None): The image height.
+        - box (tuple): The maximum width and height.
+
+    Returns:
+        - tuple: The fitted width and height, the box itself when the dimensions are unknown.
+    """
+    if not width or not height:
+        return box
+    scale = min(box[0] / width, box[1] / height, 1)
+    return max(round(width * scale), 1), max(round(height * scale), 1)
@@ -1,4 +1,17 @@
-from django.utils.safestring import mark_safe
+import hashlib
+from typing import Dict, Iterable, Optional
+
+from django.contrib.admin.utils import quote, unquote
+from django.core.cache import caches
+from django.http import FileResponse, Http404
+from django.urls import path, reverse
+from django.utils.html import format_html
+from django.utils.cache import patch_cache_control
+from django.utils.translation import gettext_lazy as _
+
+from .metadata import get_images_metadata
+from .placeholders import get_placeholder_cache_key, make_placeholder, PLACEHOLDER_CACHE_ALIAS
+from .thumbnails import ThumbnailGenerator, THUMBNAIL_FORMATS
 
 
 class ImageFieldDisplayAdminMixin:
@@ -9,7 +22,30 @@ class ImageFieldDisplayAdminMixin:
     'image_display' field to the fieldsets and readonly_fields if an 'image' field exists, allowing for the images to
     be displayed directly in the admin interface. The actual display rendering is handled by the `image_display`
     method, which relies on an external `create_image_html` function to generate the HTML for displaying the image.
+
+    Images are displayed through thumbnails served by the admin itself, generated on first access in the configured
+    sizes and format and cached on disk, so the change form no longer downloads the original file. Add
+    `image_thumbnail` to `list_display` to show lazy-loaded thumbnails in the changelist, and run the
+    `warm_thumbnails` management command after importing images so the first page views don't generate them.
+
+    Each image also gets a tiny blurred placeholder, computed when the image is saved through the admin or by the
+    `backfill_placeholders` management command, and inlined as the background of the thumbnails so the page layout
+    and colors are right before any image arrives.
     """
+    #: The thumbnail sizes, mapping their names to the maximum width and height.
+    thumbnail_sizes = {'small': (100, 100), 'large': (400, 400)}
+    #: The thumbnail size displayed by the `image_thumbnail` changelist column.
+    list_thumbnail_size = 'small'
+    #: The format of the thumbnails, a key of `THUMBNAIL_FORMATS`.
+    thumbnail_format = 'webp'
+    #: The generator class producing and caching the thumbnails.
+    thumbnail_generator_class = ThumbnailGenerator
+    #: How long browsers may keep a thumbnail, its URL changes with the image file name.
+    thumbnail_max_age = 60 * 60 * 24
+    #: The name of a companion text field storing the placeholders, when None they are stored in the cache.
+    placeholder_field = None
+    #: The maximum width and height of the placeholders.
+    placeholder_size = (16, 16)
 
     def get_fieldsets(self, request, obj=None):
         """
@@ -78,12 +114,264 @@ class ImageFieldDisplayAdminMixin:
         Returns:
             - str: HTML for displaying the image within the admin interface.
         """
-        return mark_safe(
-            f"""
-                <a href='{obj.image.url}'><img src="{obj.image.url}" style="height:400px; width: 400px; 
-                    border-radius: 50%; border: 6px solid gray;">
-                </a>
+        if not obj.image:
+            return ''
+        return format_html(
             """
+                <a href='{}'><img src="{}" style="height:400px; width: 400px;
+                    border-radius: 50%; border: 6px solid gray;{}">
+                </a>
+            """,
+            self.get_image_metadata(obj)['url'],
+            self.get_thumbnail_url(obj, 'large'),
+            self.get_placeholder_style(self.get_image_placeholder(obj), '100% 100%'),
         )
 
     image_display.short_description = ""
+
+    def image_thumbnail(self, obj):
+        """
+        Generates the HTML of a small thumbnail, meant to be added to `list_display`.
+
+        The image is lazy-loaded, so rows below the fold cost nothing until scrolled into view, and its explicit
+        dimensions reserve its box so the table doesn't shift while thumbnails arrive. Every thumbnail size is listed
+        in `srcset` with its actual width, letting high density screens pick a larger one. The dimensions are computed
+        by the thumbnail generator from the image metadata, loaded for the whole page at once by
+        `get_changelist_instance`.
+
+        Args:
+            - obj (Model instance): The model instance containing the image to display.
+
+        Returns:
+            - str: HTML for displaying the thumbnail within the changelist.
+        """
+        if not obj.image:
+            return ''
+        metadata = self.get_image_metadata(obj)
+        generator = self.get_thumbnail_generator()
+        sizes = {
+            size: generator.get_thumbnail_size(metadata['width'], metadata['height'], box)
+            for size, box in self.thumbnail_sizes.items()
+        }
+        width, height = sizes[self.list_thumbnail_size]
+        # Images smaller than several sizes get identical thumbnails, a width may only be listed once
+        candidates = {}
+        for size, (size_width, size_height) in sizes.items():
+            candidates.setdefault(size_width, self.get_thumbnail_url(obj, size))
+        srcset = ', '.join(f'{url} {size_width}w' for size_width, url in candidates.items())
+        return format_html(
+            '<img src="{}" srcset="{}" sizes="{}px" width="{}" height="{}" loading="lazy" decoding="async" alt="" '
+            'style="object-fit: contain;{}">',
+            self.get_thumbnail_url(obj, self.list_thumbnail_size),
+            srcset,
+            width,
+            width,
+            height,
+            self.get_placeholder_style(self.get_image_placeholder(obj), 'contain'),
+        )
+
+    image_thumbnail.short_description = _("Image")
+
+    def get_placeholder_style(self, placeholder: Optional[str], background_size: str) -> str:
+        """
+        Returns the inline CSS showing a placeholder behind an image until it loads.
+
+        Args:
+            - placeholder (str or None): The placeholder data URI.
+            - background_size (str): The CSS `background-size`, matching how the image is fitted in its box.
+
+        Returns:
+            - str: The CSS declarations, empty without placeholder.
+        """
+        if not placeholder:
+            return ''
+        return f' background: url({placeholder}) center / {background_size} no-repeat;'
+
+    def get_image_placeholder(self, obj) -> Optional[str]:
+        """
+        Returns the stored placeholder of an instance's image, placeholders are never computed while rendering.
+
+        Args:
+            - obj (Model instance): The model instance containing the image.
+
+        Returns:
+            - str or None: The placeholder data URI, or None if it wasn't computed yet.
+        """
+        if self.placeholder_field:
+            return getattr(obj, self.placeholder_field) or None
+        if '_image_placeholder' not in obj.__dict__:
+            obj._image_placeholder = caches[PLACEHOLDER_CACHE_ALIAS].get(get_placeholder_cache_key(obj.image.name))
+        return obj._image_placeholder
+
+    def get_image_placeholders(self, objs: Iterable) -> Dict:
+        """
+        Returns the stored placeholders of several instances, with a single cache lookup.
+
+        Args:
+            - objs (Iterable): The model instances.
+
+        Returns:
+            - dict: Maps the primary keys of the instances having an image to their placeholder or None.
+        """
+        objs = [obj for obj in objs if obj.image]
+        if self.placeholder_field:
+            return {obj.pk: getattr(obj, self.placeholder_field) or None for obj in objs}
+        keys = {obj.pk: get_placeholder_cache_key(obj.image.name) for obj in objs}
+        found = caches[PLACEHOLDER_CACHE_ALIAS].get_many(keys.values())
+        return {pk: found.get(key) for pk, key in keys.items()}
+
+    def get_image_metadata(self, obj) -> Dict:
+        """
+        Returns the metadata of an instance's image, from the page batch when loaded by the changelist.
+
+        Args:
+            - obj (Model instance): The model instance containing the image.
+
+        Returns:
+            - dict: The `url`, `width`, `height`, `content_type`, `size` and `mtime` of the image.
+        """
+        if '_image_metadata' not in obj.__dict__:
+            obj._image_metadata = get_images_metadata([obj.image])[obj.image.name]
+        return obj._image_metadata
+
+    def load_images_metadata(self, objs: Iterable) -> None:
+        """
+        Loads the metadata and placeholders of the images of several instances in one batch, storing them on the
+        instances so rendering them needs no storage call or cache lookup.
+
+        Args:
+            - objs (Iterable): The model instances.
+        """
+        objs = [obj for obj in objs if obj.image]
+        metadata = get_images_metadata(obj.image for obj in objs)
+        placeholders = self.get_image_placeholders(objs)
+        for obj in objs:
+            obj._image_metadata = metadata[obj.image.name]
+            if not self.placeholder_field:
+                obj._image_placeholder = placeholders.get(obj.pk)
+
+    def get_changelist_instance(self, request):
+        """
+        Builds the changelist, then loads the image metadata of the displayed page in one batch when the
+        `image_thumbnail` column is displayed.
+
+        Args:
+            - request (HttpRequest): The request object.
+
+        Returns:
+            - ChangeList: The changelist instance.
+        """
+        changelist = super().get_changelist_instance(request)
+        if request.method == 'GET' and 'image_thumbnail' in changelist.list_display:
+            # Evaluating the page here fills its result cache, the template iterates the same instances
+            self.load_images_metadata(changelist.result_list)
+        return changelist
+
+    def update_image_placeholder(self, obj) -> Optional[str]:
+        """
+        Computes and stores the placeholder of an instance's image.
+
+        Args:
+            - obj (Model instance): The saved model instance.
+
+        Returns:
+            - str or None: The placeholder data URI, or None if the instance has no image.
+        """
+        placeholder = make_placeholder(obj.image, self.placeholder_size) if obj.image else None
+        if self.placeholder_field:
+            # update() stores the placeholder without sending the save signals again
+            type(obj)._default_manager.filter(pk=obj.pk).update(**{self.placeholder_field: placeholder or ''})
+            setattr(obj, self.placeholder_field, placeholder or '')
+        elif placeholder:
+            caches[PLACEHOLDER_CACHE_ALIAS].set(get_placeholder_cache_key(obj.image.name), placeholder, None)
+            obj._image_placeholder = placeholder
+        return placeholder
+
+    def save_model(self, request, obj, form, change):
+        """
+        Saves the instance, then computes the placeholder of a new or replaced image.
+
+        Args:
+            - request (HttpRequest): The request object.
+            - obj (Model instance): The instance being saved.
+            - form (ModelForm): The validated form.
+            - change (bool): Whether the instance already existed.
+        """
+        super().save_model(request, obj, form, change)
+        if 'image' in form.changed_data or (obj.image and not self.get_image_placeholder(obj)):
+            self.update_image_placeholder(obj)
+
+    def get_thumbnail_generator(self) -> ThumbnailGenerator:
+        """
+        Returns the generator producing the thumbnails of the admin.
+
+        Returns:
+            - ThumbnailGenerator: An instance of `thumbnail_generator_class`.
+        """
+        return self.thumbnail_generator_class()
+
+    def get_thumbnail_url(self, obj, size: str, fmt: str = None) -> str:
+        """
+        Returns the URL of a thumbnail of an instance's image.
+
+        The image file name is hashed into the query string, so a replaced image gets a new URL and bypasses the
+        browser cache. No file is read or generated until the URL is requested.
+
+        Args:
+            - obj (Model instance): The model instance containing the image.
+            - size (str): The thumbnail size, a key of `thumbnail_sizes`.
+            - fmt (str, optional): The thumbnail format. Defaults to `thumbnail_format`.
+
+        Returns:
+            - str: The thumbnail URL.
+        """
+        url = reverse(
+            f'{self.admin_site.name}:{self.opts.app_label}_{self.opts.model_name}_thumbnail',
+            args=(quote(obj.pk), size, fmt or self.thumbnail_format),
+        )
+        version = hashlib.md5(obj.image.name.encode(), usedforsecurity=False).hexdigest()[:8]
+        return f'{url}?v={version}'
+
+    def thumbnail_view(self, request, object_id, size, fmt):
+        """
+        Serves a thumbnail of an instance's image, generating it on first access.
+
+        Args:
+            - request (HttpRequest): The request object.
+            - object_id (str): The ID of the instance.
+            - size (str): The thumbnail size, a key of `thumbnail_sizes`.
+            - fmt (str): The thumbnail format, a key of `THUMBNAIL_FORMATS`.
+
+        Returns:
+            - FileResponse: The thumbnail file.
+
+        Raises:
+            - Http404: If the size or format is unknown, the instance doesn't exist or isn't visible, or has no image.
+        """
+        if size not in self.thumbnail_sizes or fmt not in THUMBNAIL_FORMATS:
+            raise Http404
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None or not self.has_view_or_change_permission(request, obj) or not obj.image:
+            raise Http404
+        generator = self.get_thumbnail_generator()
+        path = generator.get_thumbnail(obj.image, self.thumbnail_sizes[size], fmt)
+        response = FileResponse(open(path, 'rb'), content_type=generator.get_content_type(fmt))
+        patch_cache_control(response, private=True, max_age=self.thumbnail_max_age)
+        return response
+
+    def get_urls(self):
+        """
+        Adds the URL serving the thumbnails to the admin's URL patterns.
+
+        Returns:
+            - list: The URL patterns of the admin.
+        """
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                '<path:object_id>/thumbnail/<str:size>.<str:fmt>',
+                self.admin_site.admin_view(self.thumbnail_view, cacheable=True),
+                name='%s_%s_thumbnail' % info,
+            ),
+            *super().get_urls(),
+        ]
@@ -0,0 +1,48 @@
+import base64
+import hashlib
+import io
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+
+#: The cache alias holding the placeholders of the admins without a companion field.
+PLACEHOLDER_CACHE_ALIAS = 'default'
+
+
+def get_placeholder_cache_key(name: str) -> str:
+    """
+    Returns the cache key holding the placeholder of an image.
+
+    Args:
+        - name (str): The storage name of the image, uploads get a new name so replaced images get a new key.
+
+    Returns:
+        - str: The cache key.
+    """
+    return 'image-placeholder:%s' % hashlib.md5(name.encode(), usedforsecurity=False).hexdigest()
+
+
+def make_placeholder(field_file, size: Tuple[int, int] = (16, 16), quality: int = 50) -> str:
+    """
+    Encodes a tiny, low quality version of an image as a data URI, meant to be inlined and upscaled by the browser
+    while the actual image loads.
+
+    Args:
+        - field_file (FieldFile): The source image.
+        - size (tuple, optional): The maximum width and height of the placeholder. Defaults to (16, 16).
+        - quality (int, optional): The JPEG quality. Defaults to 50.
+
+    Returns:
+        - str: A `data:image/jpeg;base64,...` URI of a few hundred bytes.
+    """
+    with field_file.storage.open(field_file.name, 'rb') as source:
+        image = Image.open(source)
+        image.draft('RGB', size)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(size, Image.Resampling.BILINEAR)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=quality)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
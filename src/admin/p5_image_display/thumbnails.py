@@ -0,0 +1,198 @@
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+from PIL import Image, ImageOps
+
+from .metadata import fit_size, get_image_orientation, get_images_metadata, get_oriented_size
+
+#: The supported thumbnail formats, mapping their URL extension to the Pillow format, content type and save options.
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', 'image/png', {'optimize': True}),
+}
+
+
+def get_thumbnail_dir() -> str:
+    """
+    Returns the directory holding the generated thumbnails.
+
+    Returns:
+        - str: The `ADMIN_THUMBNAIL_DIR` setting, defaulting to an `admin-thumbnails` folder in `MEDIA_ROOT`.
+    """
+    return getattr(settings, 'ADMIN_THUMBNAIL_DIR', None) or os.path.join(settings.MEDIA_ROOT, 'admin-thumbnails')
+
+
+class ThumbnailGenerator:
+    """
+    Generates resized variants of images on first access and caches them on disk.
+
+    A thumbnail is keyed by the source name, its modification time and byte size, and the requested size and format,
+    so replacing or editing the source image yields a new thumbnail while the previous one is simply never read again.
+    The modification time and size come from the image metadata cache, the source is only read from storage on a miss.
+    Files are written to a temporary name and moved into place, so readers never see a partial thumbnail. Concurrent
+    first requests for the same thumbnail in a process wait for a single generation, other processes may generate it
+    too, with the last atomic move winning.
+    """
+    #: Guards the creation of the per-thumbnail locks.
+    locks_lock = threading.Lock()
+    #: Maps the cache keys of the thumbnails being generated to their lock.
+    locks = {}
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """
+        Initializes the generator.
+
+        Args:
+            - directory (str, optional): The directory holding the thumbnails. Defaults to `get_thumbnail_dir()`.
+        """
+        self.directory = directory or get_thumbnail_dir()
+
+    def get_cache_key(self, field_file, size: Tuple[int, int], fmt: str) -> str:
+        """
+        Computes the cache key of a thumbnail from the state of its source image, as recorded in the image metadata
+        cache, so serving a cached thumbnail needs no storage call.
+
+        Args:
+            - field_file (FieldFile): The source image.
+            - size (tuple): The maximum width and height of the thumbnail.
+            - fmt (str): The thumbnail format, a key of `THUMBNAIL_FORMATS`.
+
+        Returns:
+            - str: The hexadecimal cache key.
+        """
+        metadata = get_images_metadata([field_file])[field_file.name]
+        parts = [
+            field_file.name,
+            str(metadata['mtime']),
+            str(metadata['size']),
+            '%dx%d' % size,
+            fmt,
+        ]
+        return hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+
+    def get_thumbnail_size(self, width: Optional[int], height: Optional[int], size: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Returns the dimensions of a thumbnail without generating it.
+
+        Args:
+            - width (int or None): The displayed width of the source image, e.g. from its metadata.
+            - height (int or None): The displayed height of the source image.
+            - size (tuple): The maximum width and height of the thumbnail.
+
+        Returns:
+            - tuple: The width and height of the thumbnail, the maximum size when the source dimensions are unknown.
+        """
+        return fit_size(width, height, size)
+
+    def get_cache_path(self, key: str, fmt: str) -> str:
+        """
+        Returns the path of a cached thumbnail, spread over subdirectories to keep them small.
+
+        Args:
+            - key (str): The cache key of the thumbnail.
+            - fmt (str): The thumbnail format.
+
+        Returns:
+            - str: The absolute path of the thumbnail file.
+        """
+        return os.path.join(self.directory, key[:2], f'{key}.{fmt}')
+
+    def get_lock(self, key: str) -> threading.Lock:
+        """
+        Returns the lock serializing the generation of a thumbnail.
+
+        Args:
+            - key (str): The cache key of the thumbnail.
+
+        Returns:
+            - threading.Lock: The lock shared by the threads requesting the same thumbnail.
+        """
+        with self.locks_lock:
+            return self.locks.setdefault(key, threading.Lock())
+
+    def get_thumbnail(self, field_file, size: Tuple[int, int], fmt: str = 'webp') -> str:
+        """
+        Returns the path of a thumbnail, generating it on first access.
+
+        Args:
+            - field_file (FieldFile): The source image.
+            - size (tuple): The maximum width and height of the thumbnail, the aspect ratio is kept.
+            - fmt (str, optional): The thumbnail format, a key of `THUMBNAIL_FORMATS`. Defaults to 'webp'.
+
+        Returns:
+            - str: The absolute path of the thumbnail file.
+
+        Raises:
+            - ImproperlyConfigured: If the format isn't supported.
+        """
+        if fmt not in THUMBNAIL_FORMATS:
+            raise ImproperlyConfigured(_('Unsupported thumbnail format: %s.') % fmt)
+        key = self.get_cache_key(field_file, size, fmt)
+        path = self.get_cache_path(key, fmt)
+        if os.path.exists(path):
+            return path
+
+        lock = self.get_lock(key)
+        with lock:
+            # Another thread may have generated the thumbnail while this one waited for the lock
+            if not os.path.exists(path):
+                self.generate(field_file, size, fmt, path)
+        with self.locks_lock:
+            self.locks.pop(key, None)
+        return path
+
+    def generate(self, field_file, size: Tuple[int, int], fmt: str, path: str) -> None:
+        """
+        Resizes an image and writes it atomically to the cache.
+
+        Args:
+            - field_file (FieldFile): The source image.
+            - size (tuple): The maximum width and height of the thumbnail.
+            - fmt (str): The thumbnail format.
+            - path (str): The destination path.
+        """
+        pil_format, content_type, options = THUMBNAIL_FORMATS[fmt]
+        with field_file.storage.open(field_file.name, 'rb') as source:
+            image = Image.open(source)
+            # Resizing to the computed size, rather than with thumbnail(), makes it match get_thumbnail_size()
+            oriented_size = get_oriented_size(image)
+            thumbnail_size = self.get_thumbnail_size(*oriented_size, size)
+            # draft() lets the JPEG decoder downscale while decoding, a large speedup for big photos
+            image.draft('RGB', thumbnail_size if oriented_size == image.size else thumbnail_size[::-1])
+            if get_image_orientation(image) != 1:
+                image = ImageOps.exif_transpose(image)
+            if image.size != thumbnail_size:
+                image = image.resize(thumbnail_size, Image.Resampling.LANCZOS)
+            # An image already small enough is still only opened, it must be decoded before the source is closed
+            image.load()
+        if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as temp:
+                image.save(temp, pil_format, **options)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def get_content_type(self, fmt: str) -> str:
+        """
+        Returns the content type of a thumbnail format.
+
+        Args:
+            - fmt (str): The thumbnail format.
+
+        Returns:
+            - str: The MIME type.
+        """
+        return THUMBNAIL_FORMATS[fmt][1]
@@ -0,0 +1,119 @@
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+
+#: The HTML of an icon link, `{url}` is escaped per cell, `{icon}` once per icon when the renderer is compiled.
+LINK_TEMPLATE = '<a href="{url}" title="{icon} link"><i class="fab fa-{icon}"></i></a>'
+
+
+class DomainIconIndex:
+    """
+    Maps URL domains to icon names by suffix, e.g. `youtube.com` also matches `www.youtube.com` and `m.youtube.com`.
+
+    The domains are compiled into a trie of their reversed labels, so a lookup walks the labels of the host once,
+    whatever the number of domains, and the longest matching suffix wins.
+    """
+
+    def __init__(self, domain_icons: Dict[str, str]) -> None:
+        """
+        Compiles the index.
+
+        Args:
+            - domain_icons (dict): Maps domains to icon names.
+        """
+        self.root = {}
+        for domain, icon in domain_icons.items():
+            node = self.root
+            for label in reversed(domain.lower().strip('.').split('.')):
+                node = node.setdefault(label, {})
+            # The empty key can't collide with a label and holds the icon of the domain ending at this node
+            node[''] = icon
+
+    def lookup(self, url: str) -> Optional[str]:
+        """
+        Returns the icon of the longest domain suffix matching the host of a URL.
+
+        Args:
+            - url (str): The URL.
+
+        Returns:
+            - str or None: The icon name, or None if no domain matches.
+        """
+        try:
+            host = urlsplit(url).hostname
+        except ValueError:
+            return None
+        if not host:
+            return None
+        icon, node = None, self.root
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            icon = node.get('', icon)
+        return icon
+
+
+class URLCellRenderer:
+    """
+    A compiled `list_display` callable rendering a URL field as an icon link.
+
+    The icon mapping is resolved and the HTML of every known icon is escaped when the renderer is built, so rendering
+    a cell only reads the URL, looks up its domain and escapes it.
+    """
+
+    def __init__(self, field, default_icon: str, domain_index: Optional[DomainIconIndex] = None) -> None:
+        """
+        Compiles the renderer of a URL field.
+
+        Args:
+            - field (URLField): The rendered field.
+            - default_icon (str): The icon used when no domain matches.
+            - domain_index (DomainIconIndex, optional): The index mapping domains to icons. Defaults to None.
+        """
+        self.attname = field.attname
+        self.domain_index = domain_index
+        self.default_icon = default_icon
+        self.templates = {}
+        self.default_template = self.get_template(default_icon)
+        #: The attributes read by the admin from `list_display` callables.
+        self.__name__ = field.name
+        self.short_description = field.verbose_name
+
+    def get_template(self, icon: str) -> str:
+        """
+        Returns the link template of an icon, with the icon already escaped, compiling it on first use.
+
+        Args:
+            - icon (str): The icon name.
+
+        Returns:
+            - str: The template, only missing the URL.
+        """
+        template = self.templates.get(icon)
+        if template is None:
+            template = self.templates[icon] = LINK_TEMPLATE.replace('{icon}', escape(icon))
+        return template
+
+    def __call__(self, obj):
+        """
+        Renders the link of an instance's URL.
+
+        Args:
+            - obj (Model instance): The instance displayed in the row.
+
+        Returns:
+            - str or None: The safe HTML of the link, or None for an empty URL, displayed as the admin's empty value.
+        """
+        url = getattr(obj, self.attname)
+        if not url:
+            return None
+        template = self.default_template
+        if self.domain_index is not None:
+            icon = self.domain_index.lookup(url)
+            if icon is not None:
+                template = self.get_template(icon)
+        return mark_safe(template.replace('{url}', escape(url)))
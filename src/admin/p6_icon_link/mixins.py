@@ -1,5 +1,6 @@
 from django.db import models
-from django.utils.safestring import mark_safe
+
+from .icons import DomainIconIndex, URLCellRenderer
 
 
 class URLFieldShowLinkAdminMixin:
@@ -9,11 +10,28 @@ class URLFieldShowLinkAdminMixin:
     allows for customization of the icon displayed next to a URL. The mixin works by overriding the  `get_list_display`
     method to include a custom display function for URL fields, which  renders an HTML link with an icon based on the
     field's name.
+
+    One renderer is compiled per URL field and reused by every request, with the icons resolved and escaped up front.
+    URLs are escaped, and `domain_icon_map` picks the icon from the domain of each URL, falling back to the field icon.
     """
     #: This dictionary maps field names to icon names, it`s used to customize the icons displayed in the admin list display.
     field_icon_map = {
         'video': 'youtube',
     }
+    #: This dictionary maps URL domains to icon names, subdomains included, e.g. `youtube.com` matches `m.youtube.com`.
+    domain_icon_map = {}
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the admin and the cache of the compiled renderers.
+
+        Args:
+            - *args: Variable length argument list passed to the superclass.
+            - **kwargs: Arbitrary keyword arguments passed to the superclass.
+        """
+        super().__init__(*args, **kwargs)
+        self.url_field_renderers = {}
+        self.domain_icon_index = DomainIconIndex(self.domain_icon_map) if self.domain_icon_map else None
 
     def get_field_icon_name(self, field_name: str) -> str:
         """
@@ -40,7 +58,7 @@ class URLFieldShowLinkAdminMixin:
         """
         return tuple(field.name for field in self.model._meta.fields if isinstance(field, models.URLField))
 
-    def create_url_field_display_func(self, field_name: str):
+    def create_url_field_display_func(self, field_name: str) -> URLCellRenderer:
         """
         Creates a function to display a URL field with an associated icon in the admin list.
 
@@ -48,20 +66,26 @@ class URLFieldShowLinkAdminMixin:
             - field_name (str): The name of the URL field for which to create the display function.
 
         Returns:
-            - function: A function that takes an object as its only argument and returns HTML code to display the URL
-              field value with an icon link.
+            - URLCellRenderer: A callable that takes an object as its only argument and returns HTML code to display
+              the URL field value with an icon link, its `short_description` is the verbose name of the field.
+        """
+        field = self.model._meta.get_field(field_name)
+        return URLCellRenderer(field, self.get_field_icon_name(field_name), self.domain_icon_index)
+
+    def get_url_field_display_func(self, field_name: str) -> URLCellRenderer:
         """
-        # Define the display function that will be used in admin list display
-        def url_field_display_func(obj):
-            # Retrieve the URL from the object using the field name
-            url = getattr(obj, field_name)
-            # Determine the icon name based on the field name, using a predefined mapping
-            icon = self.get_field_icon_name(field_name)
-            # Generate and return the HTML string with the icon link
-            return mark_safe(f"""<a href="{url}" title="{icon} link"><i class="fab fa-{icon}"></i></a>""")
-
-        # Return the dynamically generated function
-        return url_field_display_func
+        Returns the compiled display function of a URL field, creating it on first use.
+
+        Args:
+            - field_name (str): The name of the URL field.
+
+        Returns:
+            - URLCellRenderer: The cached display function.
+        """
+        renderer = self.url_field_renderers.get(field_name)
+        if renderer is None:
+            renderer = self.url_field_renderers[field_name] = self.create_url_field_display_func(field_name)
+        return renderer
 
     def get_list_display(self, request) -> list:
         """
@@ -90,18 +114,9 @@ class URLFieldShowLinkAdminMixin:
         for field_name in list_display:
             # Checks if the current field name is one of the URL fields.
             if field_name in url_fields:
-                # Retrieves the Field instance for the URL field using Django's field lookup.
-                field = self.model._meta.get_field(field_name)
-
-                # Creates a custom display function for the URL field that will output HTML for an icon link.
-                url_field_display_func = self.create_url_field_display_func(field_name)
-
-                # Sets the `short_description` attribute of the display function to the verbose name of the field,
-                # which is used as its display name in the admin.
-                url_field_display_func.short_description = field.verbose_name
-
-                # Adds the custom display function to the list of fields to be displayed.
-                updated_list_display.append(url_field_display_func)
+                # Adds the compiled display function of the URL field, which outputs HTML for an icon link and uses
+                # the verbose name of the field as its display name in the admin.
+                updated_list_display.append(self.get_url_field_display_func(field_name))
             else:
                 # If the field is not a URL field, adds it directly to the list of fields to be displayed.
                 updated_list_display.append(field_name)
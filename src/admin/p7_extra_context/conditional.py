@@ -0,0 +1,183 @@
+import hashlib
+from typing import Optional
+
+from django.contrib import messages
+from django.middleware.csrf import get_token
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
+
+from admin.p4_model_admin_queryset.versions import get_models_version, track_model_version
+
+from .providers import ContextProvider
+
+
+class ConditionalGetAdminMixin:
+    """
+    A companion mixin to `AdminContextMixin` answering conditional GET requests of the changelist and change views.
+
+    Each model tracked by the mixin has a cheap version token, replaced by `post_save` and `post_delete` receivers.
+    The ETag of a page combines the version tokens with the request path, query string, user, language, session and
+    CSRF secret, and the version tokens of the `extra_context` providers, so a browser sending a matching
+    `If-None-Match` gets a `304 Not Modified` before any queryset or provider runs and any template is rendered. Pages
+    using a provider without a token, i.e. without a TTL or an `etag` function, aren't cached. The two views are
+    served with `Cache-Control: private, no-cache` instead of the admin's `never_cache`, so browsers keep the page and
+    revalidate it on every refresh.
+
+    The mixin must come before `AdminContextMixin` (and any other mixin doing work in the views) in the bases.
+    """
+    #: Additional models whose changes invalidate the pages, e.g. models displayed through relations.
+    conditional_dependencies = ()
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the admin and starts tracking the versions of the models the pages depend on.
+
+        Args:
+            - *args: Variable length argument list passed to the superclass.
+            - **kwargs: Arbitrary keyword arguments passed to the superclass.
+        """
+        super().__init__(*args, **kwargs)
+        for model in self.get_conditional_models():
+            track_model_version(model)
+
+    def get_conditional_models(self) -> tuple:
+        """
+        Returns the models whose changes invalidate the pages.
+
+        Returns:
+            - tuple: The admin's model, the inline models and `conditional_dependencies`.
+        """
+        return (self.model, *(inline.model for inline in self.inlines), *self.conditional_dependencies)
+
+    def get_etag_context_values(self, request) -> Optional[list]:
+        """
+        Returns the version tokens of the `extra_context` providers of `AdminContextMixin`, without computing them, so
+        providers still only run when a rendered template reads them.
+
+        Args:
+            - request (HttpRequest): The request object.
+
+        Returns:
+            - list or None: The tokens in the order of `extra_context`, or None if a provider has no token.
+        """
+        tokens = []
+        for key, value in (getattr(self, 'extra_context', None) or {}).items():
+            if isinstance(value, ContextProvider):
+                token = value.get_etag(request, self, key)
+                if token is None:
+                    return None
+                tokens.append(token)
+        return tokens
+
+    def get_etag(self, request) -> Optional[str]:
+        """
+        Computes the ETag of the current page without touching the database tables of the models.
+
+        The session key and the CSRF secret are part of the ETag, so a page cached before logging in again isn't
+        served with a stale CSRF token, which would make its next POST fail with a 403.
+
+        Args:
+            - request (HttpRequest): The request object.
+
+        Returns:
+            - str or None: The quoted ETag, or None when a context provider without a version token makes the page
+              uncacheable.
+        """
+        context_values = self.get_etag_context_values(request)
+        if context_values is None:
+            return None
+        parts = [
+            get_models_version(self.get_conditional_models()),
+            request.get_full_path(),
+            str(request.user.pk),
+            getattr(request, 'LANGUAGE_CODE', ''),
+            getattr(getattr(request, 'session', None), 'session_key', None) or '',
+            # The masked token differs on every call, the secret it ensures is stable until the next login
+            get_token(request) and request.META['CSRF_COOKIE'],
+            *context_values,
+        ]
+        return '"%s"' % hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+
+    def conditional_view(self, view, request, *args, **kwargs):
+        """
+        Answers a GET request from the browser cache when possible, otherwise runs the view and tags its response.
+
+        Args:
+            - view: The admin view to run.
+            - request (HttpRequest): The request object.
+            - *args: Positional arguments passed to the view.
+            - **kwargs: Keyword arguments passed to the view.
+
+        Returns:
+            - HttpResponse: A 304 response, or the response of the view.
+        """
+        # Pending messages are consumed when the page renders, the cached copy doesn't show them
+        if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+            response = view(request, *args, **kwargs)
+            add_never_cache_headers(response)
+            return response
+
+        # The permission check reads the user's cached permissions, no queryset is run
+        if not self.has_view_or_change_permission(request):
+            return view(request, *args, **kwargs)
+
+        etag = self.get_etag(request)
+        if etag is not None:
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                return response
+
+        response = view(request, *args, **kwargs)
+        if etag is not None and response.status_code == 200:
+            response.headers['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            add_never_cache_headers(response)
+        return response
+
+    def get_urls(self):
+        """
+        Serves the changelist and change views without the admin's `never_cache`, so their ETags are revalidated.
+
+        Returns:
+            - list: The URL patterns of the admin.
+        """
+        urls = super().get_urls()
+        info = self.opts.app_label, self.opts.model_name
+        views = {
+            '%s_%s_changelist' % info: self.changelist_view,
+            '%s_%s_change' % info: self.change_view,
+        }
+        for pattern in urls:
+            if getattr(pattern, 'name', None) in views:
+                callback = self.admin_site.admin_view(views[pattern.name], cacheable=True)
+                callback.model_admin = self
+                pattern.callback = callback
+        return urls
+
+    def changelist_view(self, request, extra_context=None):
+        """
+        Renders the changelist view, or answers it with a 304 when the browser copy is current.
+
+        - Args:
+            - request (HttpRequest): The request object.
+            - extra_context (dict, optional): Additional context to pass to the template. Defaults to None.
+
+        - Returns:
+            - HttpResponse: The rendered changelist view or a 304 response.
+        """
+        return self.conditional_view(super().changelist_view, request, extra_context)
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        """
+        Renders the change view, or answers it with a 304 when the browser copy is current.
+
+        - Args:
+            - request (HttpRequest): The request object.
+            - object_id (str): The ID of the object to be changed.
+            - form_url (str, optional): The URL for the form submission. Defaults to an empty string.
+            - extra_context (dict, optional): Additional context to pass to the template. Defaults to None.
+
+        - Returns:
+            - HttpResponse: The rendered change view or a 304 response.
+        """
+        return self.conditional_view(super().change_view, request, object_id, form_url, extra_context)
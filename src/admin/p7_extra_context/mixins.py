@@ -1,26 +1,56 @@
 from django.contrib import admin
 
+from .providers import ContextProvider, LazyContextValue
+
 
 class AdminContextMixin:
     """
     A mixin for adding extra context to admin views. This mixin ensures that additional context provided via
     `extra_context` is passed to the template context for various admin views.
+
+    Values of `extra_context` may be `ContextProvider` instances, built with the `context_provider` decorator from a
+    function of the request. They are evaluated lazily, only when the template reads their key, at most once per
+    request, and providers with a TTL share their value across requests through the cache. Other values, including
+    classes and callables without arguments such as `timezone.now`, are passed to the template unchanged.
     """
     extra_context = None
 
-    def get_context_data(self, extra_context=None):
+    def get_extra_context(self, request) -> dict:
+        """
+        Returns the class level extra context, with the providers replaced by their lazy per-request values.
+
+        - Args:
+            - request (HttpRequest): The request object.
+
+        - Returns:
+            - dict: The extra context of the request.
+        """
+        # Memoized on the request, so views calling each other share the values
+        values = request.__dict__.setdefault('_extra_context_values', {})
+        context = {}
+        for key, value in self.extra_context.items():
+            if isinstance(value, ContextProvider):
+                memo_key = self.opts.label_lower, key
+                if memo_key not in values:
+                    values[memo_key] = LazyContextValue(value, request, self, key)
+                value = values[memo_key]
+            context[key] = value
+        return context
+
+    def get_context_data(self, extra_context=None, request=None):
         """
         Updates the context with extra context data if provided.
 
         - Args:
             - extra_context (dict, optional): Additional context to be merged into the existing context.
+            - request (HttpRequest, optional): The request object, required by the context providers.
 
         - Returns:
             - dict: The updated context dictionary.
         """
-        context = super().get_context_data(extra_context=extra_context)
+        context = dict(extra_context or {})
         if self.extra_context:
-            context.update(self.extra_context)
+            context.update(self.get_extra_context(request))
         return context
 
     @admin.options.csrf_protect_m
@@ -35,7 +65,7 @@ class AdminContextMixin:
         - Returns:
             - HttpResponse: The rendered changelist view.
         """
-        context = self.get_context_data(extra_context)
+        context = self.get_context_data(extra_context, request)
         return super().changelist_view(request, context)
 
     def add_view(self, request, form_url='', extra_context=None):
@@ -50,7 +80,7 @@ class AdminContextMixin:
         - Returns:
             - HttpResponse: The rendered add view.
         """
-        context = self.get_context_data(extra_context)
+        context = self.get_context_data(extra_context, request)
         return super().add_view(request, form_url, context)
 
     def history_view(self, request, object_id, extra_context=None):
@@ -65,7 +95,7 @@ class AdminContextMixin:
         - Returns:
             - HttpResponse: The rendered history view.
         """
-        context = self.get_context_data(extra_context)
+        context = self.get_context_data(extra_context, request)
         return super().history_view(request, object_id, context)
 
     @admin.options.csrf_protect_m
@@ -81,7 +111,7 @@ class AdminContextMixin:
         - Returns:
             - HttpResponse: The rendered delete view.
         """
-        context = self.get_context_data(extra_context)
+        context = self.get_context_data(extra_context, request)
         return super().delete_view(request, object_id, context)
 
     def change_view(self, request, object_id, form_url='', extra_context=None):
@@ -97,5 +127,5 @@ class AdminContextMixin:
         - Returns:
             - HttpResponse: The rendered change view.
         """
-        context = self.get_context_data(extra_context)
+        context = self.get_context_data(extra_context, request)
         return super().change_view(request, object_id, form_url, context)
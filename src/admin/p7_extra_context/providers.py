@@ -0,0 +1,180 @@
+import logging
+import time
+from typing import Callable, Optional
+
+from django.core.cache import caches
+
+
+logger = logging.getLogger(__name__)
+
+
+class ContextProvider:
+    """
+    Wraps a function computing an `extra_context` value from the request.
+
+    The value is computed at most once per request, and only if the template reads it. With a `ttl` it is also
+    shared across requests and users through the cache, which suits counters and totals that don't depend on the user.
+    An `etag` function returning a cheap version token of the value lets conditional GETs skip the computation.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        ttl: Optional[int] = None,
+        cache_alias: str = 'default',
+        etag: Optional[Callable] = None,
+    ) -> None:
+        """
+        Initializes the provider.
+
+        Args:
+            - func (Callable): The function computing the value, called with the request.
+            - ttl (int, optional): How long the value is shared across requests, in seconds. Defaults to None, which
+              computes it once per request.
+            - cache_alias (str, optional): The cache holding the shared values. Defaults to 'default'.
+            - etag (Callable, optional): A function of the request returning a version token that changes whenever the
+              value does, e.g. the latest modification time of the counted rows. Defaults to None.
+        """
+        self.func = func
+        self.ttl = ttl
+        self.cache_alias = cache_alias
+        self.etag = etag
+
+    def __call__(self, request):
+        """
+        Calls the wrapped function, so decorated functions stay usable directly.
+
+        Args:
+            - request (HttpRequest): The request object.
+
+        Returns:
+            - The value computed by the function.
+        """
+        return self.func(request)
+
+    def get_cache_key(self, model_admin, key: str) -> str:
+        """
+        Returns the cache key holding the shared value.
+
+        Args:
+            - model_admin (ModelAdmin): The admin providing the context.
+            - key (str): The context key of the provider.
+
+        Returns:
+            - str: The cache key.
+        """
+        return f'extra-context:{model_admin.opts.label_lower}:{key}'
+
+    def get_etag(self, request, model_admin, key: str) -> Optional[str]:
+        """
+        Returns a version token of the value without computing it, for the ETag of conditional GETs.
+
+        Providers with a TTL change at most once per TTL window, so the window is their token, bounding the staleness
+        of a 304 by the TTL like the cache does.
+
+        Args:
+            - request (HttpRequest): The request object.
+            - model_admin (ModelAdmin): The admin providing the context.
+            - key (str): The context key of the provider.
+
+        Returns:
+            - str or None: The token, or None when the value can only be known by computing it.
+        """
+        if self.etag is not None:
+            return f'{key}:{self.etag(request)}'
+        if self.ttl is not None:
+            return f'{self.get_cache_key(model_admin, key)}:{int(time.time() // self.ttl)}'
+        return None
+
+    def compute(self, request, model_admin, key: str):
+        """
+        Computes the value, or reads it from the cache when the provider has a TTL, and logs how long it took.
+
+        Args:
+            - request (HttpRequest): The request object.
+            - model_admin (ModelAdmin): The admin providing the context.
+            - key (str): The context key of the provider.
+
+        Returns:
+            - The value of the provider.
+        """
+        start = time.perf_counter()
+        source = 'computed'
+        if self.ttl is None:
+            value = self.func(request)
+        else:
+            cache, cache_key = caches[self.cache_alias], self.get_cache_key(model_admin, key)
+            value = cache.get(cache_key, self)
+            if value is self:
+                value = self.func(request)
+                cache.set(cache_key, value, self.ttl)
+            else:
+                source = 'cached'
+        logger.debug(
+            '%s context provider %r %s in %.1f ms',
+            model_admin.opts.label, key, source, (time.perf_counter() - start) * 1000,
+        )
+        return value
+
+
+class LazyContextValue:
+    """
+    The per-request value of a `ContextProvider` placed in the template context.
+
+    Templates call callable variables when they resolve them, so the provider runs on the first read and the result
+    is reused by the following ones.
+    """
+
+    def __init__(self, provider: ContextProvider, request, model_admin, key: str) -> None:
+        """
+        Initializes the lazy value.
+
+        Args:
+            - provider (ContextProvider): The provider computing the value.
+            - request (HttpRequest): The request object.
+            - model_admin (ModelAdmin): The admin providing the context.
+            - key (str): The context key of the provider.
+        """
+        self.provider = provider
+        self.request = request
+        self.model_admin = model_admin
+        self.key = key
+        self.evaluated = False
+        self.value = None
+
+    def __call__(self):
+        """
+        Returns the value, computing it on first call.
+
+        Returns:
+            - The value of the provider.
+        """
+        if not self.evaluated:
+            self.value = self.provider.compute(self.request, self.model_admin, self.key)
+            self.evaluated = True
+        return self.value
+
+
+def context_provider(
+    func: Optional[Callable] = None,
+    *,
+    ttl: Optional[int] = None,
+    cache_alias: str = 'default',
+    etag: Optional[Callable] = None,
+):
+    """
+    Decorator turning a function of the request into a `ContextProvider`, usable as an `extra_context` value.
+
+    Args:
+        - func (Callable, optional): The decorated function, when used without arguments.
+        - ttl (int, optional): How long the value is shared across requests, in seconds. Defaults to None.
+        - cache_alias (str, optional): The cache holding the shared values. Defaults to 'default'.
+        - etag (Callable, optional): A function of the request returning a version token of the value. Defaults to
+          None.
+
+    Returns:
+        - ContextProvider or Callable: The provider, or a decorator building it when arguments are given.
+    """
+    if func is not None:
+        return ContextProvider(func, ttl, cache_alias, etag)
+    return lambda func: ContextProvider(func, ttl, cache_alias, etag)
@@ -0,0 +1,195 @@
+import logging
+import warnings
+
+from django.conf import settings
+from django.contrib import admin
+
+from .recorder import QueryRecorder
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetWarning(RuntimeWarning):
+    """
+    Warning issued when an admin view exceeds its query budget or repeats a query once per row.
+    """
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Error raised in strict mode (e.g. under tests) when an admin view exceeds its query budget or repeats a query
+    once per row.
+    """
+
+
+class QueryBudgetAdminMixin:
+    """
+    A mixin for Django admin classes that counts the queries run by each admin view and detects N+1 patterns.
+
+    Every statement executed while the view runs, template rendering included, is recorded and grouped by shape
+    (the SQL with its parameters stripped). A view exceeding its query budget, or running the same shape at least
+    `query_repeat_threshold` times, is reported: with a `QueryBudgetWarning` when `DEBUG` is on, and with a
+    `QueryBudgetExceeded` error when the `QUERY_BUDGET_STRICT` setting is on, which is meant for tests. With both off
+    the views run untouched.
+    """
+    #: The maximum number of queries per view, either an integer or a dict mapping view names to integers.
+    query_budget = None
+    #: The number of executions of the same statement shape from which it is reported as an N+1 pattern.
+    query_repeat_threshold = 5
+
+    def is_query_budget_strict(self) -> bool:
+        """
+        Returns whether violations raise instead of warning.
+
+        Returns:
+            - bool: The value of the `QUERY_BUDGET_STRICT` setting.
+        """
+        return getattr(settings, 'QUERY_BUDGET_STRICT', False)
+
+    def is_query_budget_enabled(self) -> bool:
+        """
+        Returns whether the queries of the admin views are recorded.
+
+        Returns:
+            - bool: True in DEBUG or strict mode, False otherwise.
+        """
+        return settings.DEBUG or self.is_query_budget_strict()
+
+    def get_query_budget(self, view_name: str):
+        """
+        Returns the query budget of an admin view.
+
+        Args:
+            - view_name (str): The name of the view, e.g. 'changelist' or 'change'.
+
+        Returns:
+            - int or None: The maximum number of queries, or None if the view has no budget.
+        """
+        if isinstance(self.query_budget, dict):
+            return self.query_budget.get(view_name)
+        return self.query_budget
+
+    def check_query_budget(self, view_name: str, recorder: QueryRecorder) -> None:
+        """
+        Reports the budget violations and N+1 patterns recorded for a view.
+
+        Args:
+            - view_name (str): The name of the view.
+            - recorder (QueryRecorder): The queries recorded while the view ran.
+
+        Raises:
+            - QueryBudgetExceeded: If a violation is found in strict mode.
+        """
+        label = f'{self.opts.label} {view_name} view'
+        problems = []
+        budget = self.get_query_budget(view_name)
+        if budget is not None and recorder.count > budget:
+            problems.append(f'{label} ran {recorder.count} queries, exceeding its budget of {budget}.')
+        for shape, count in recorder.get_repeated_shapes(self.query_repeat_threshold):
+            problems.append(f'{label} ran the same query {count} times, likely an N+1 pattern: {shape}')
+        if not problems:
+            return
+        if self.is_query_budget_strict():
+            raise QueryBudgetExceeded('\n'.join(problems))
+        for problem in problems:
+            logger.warning(problem)
+            warnings.warn(problem, QueryBudgetWarning)
+
+    def run_with_query_budget(self, view_name: str, view, *args, **kwargs):
+        """
+        Runs an admin view while recording its queries, then checks them against the budget.
+
+        Template responses are rendered inside the recording window, as most per-row queries come from
+        `list_display` callables evaluated while rendering.
+
+        Args:
+            - view_name (str): The name of the view.
+            - view: The view callable.
+            - *args: Positional arguments passed to the view.
+            - **kwargs: Keyword arguments passed to the view.
+
+        Returns:
+            - HttpResponse: The response of the view.
+        """
+        if not self.is_query_budget_enabled():
+            return view(*args, **kwargs)
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = view(*args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        self.check_query_budget(view_name, recorder)
+        return response
+
+    @admin.options.csrf_protect_m
+    def changelist_view(self, request, extra_context=None):
+        """
+        Renders the changelist view within the query budget.
+
+        - Args:
+            - request (HttpRequest): The request object.
+            - extra_context (dict, optional): Additional context to pass to the template. Defaults to None.
+
+        - Returns:
+            - HttpResponse: The rendered changelist view.
+        """
+        return self.run_with_query_budget('changelist', super().changelist_view, request, extra_context)
+
+    def add_view(self, request, form_url='', extra_context=None):
+        """
+        Renders the add view within the query budget.
+
+        - Args:
+            - request (HttpRequest): The request object.
+            - form_url (str, optional): The URL for the form submission. Defaults to an empty string.
+            - extra_context (dict, optional): Additional context to pass to the template. Defaults to None.
+
+        - Returns:
+            - HttpResponse: The rendered add view.
+        """
+        return self.run_with_query_budget('add', super().add_view, request, form_url, extra_context)
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        """
+        Renders the change view within the query budget.
+
+        - Args:
+            - request (HttpRequest): The request object.
+            - object_id (str): The ID of the object to be changed.
+            - form_url (str, optional): The URL for the form submission. Defaults to an empty string.
+            - extra_context (dict, optional): Additional context to pass to the template. Defaults to None.
+
+        - Returns:
+            - HttpResponse: The rendered change view.
+        """
+        return self.run_with_query_budget('change', super().change_view, request, object_id, form_url, extra_context)
+
+    @admin.options.csrf_protect_m
+    def delete_view(self, request, object_id, extra_context=None):
+        """
+        Renders the delete view within the query budget.
+
+        - Args:
+            - request (HttpRequest): The request object.
+            - object_id (str): The ID of the object to be deleted.
+            - extra_context (dict, optional): Additional context to pass to the template. Defaults to None.
+
+        - Returns:
+            - HttpResponse: The rendered delete view.
+        """
+        return self.run_with_query_budget('delete', super().delete_view, request, object_id, extra_context)
+
+    def history_view(self, request, object_id, extra_context=None):
+        """
+        Renders the history view within the query budget.
+
+        - Args:
+            - request (HttpRequest): The request object.
+            - object_id (str): The ID of the object whose history is to be viewed.
+            - extra_context (dict, optional): Additional context to pass to the template. Defaults to None.
+
+        - Returns:
+            - HttpResponse: The rendered history view.
+        """
+        return self.run_with_query_budget('history', super().history_view, request, object_id, extra_context)
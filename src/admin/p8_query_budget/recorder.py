@@ -0,0 +1,82 @@
+import re
+from collections import Counter
+from contextlib import contextmanager, ExitStack
+from typing import List, Tuple
+
+from django.db import connections
+
+
+#: Matches a parenthesized list of placeholders, e.g. the right-hand side of `IN (%s, %s, %s)`.
+PLACEHOLDER_LIST_RE = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+#: Matches literals inlined in raw SQL: quoted strings and numbers.
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Reduces a SQL statement to its shape, so statements differing only in parameters compare equal.
+
+    Args:
+        - sql (str): The SQL statement, with or without placeholders.
+
+    Returns:
+        - str: The statement with literals replaced by `%s` and placeholder lists of any length collapsed.
+    """
+    sql = LITERAL_RE.sub('%s', sql)
+    return PLACEHOLDER_LIST_RE.sub('(%s, ...)', sql)
+
+
+class QueryRecorder:
+    """
+    Records the SQL statements executed on every database connection while active.
+
+    The recorder is installed as a database execute wrapper, so it works without `DEBUG` and sees the statements
+    before parameters are interpolated, which makes statements issued once per row easy to group by shape.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty recorder.
+        """
+        self.shapes = Counter()
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Records a statement and executes it.
+
+        Args:
+            - execute: The next callable in the execute wrapper chain.
+            - sql (str): The statement being executed.
+            - params: The statement parameters.
+            - many (bool): Whether the statement is run through `executemany`.
+            - context (dict): The execution context given by Django.
+
+        Returns:
+            - The result of the wrapped execution.
+        """
+        self.count += 1
+        self.shapes[normalize_sql(sql)] += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def record(self):
+        """
+        Installs the recorder on every database connection for the duration of the block.
+        """
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    def get_repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Returns the statement shapes executed at least `threshold` times, the signature of N+1 patterns.
+
+        Args:
+            - threshold (int): The number of repetitions from which a shape is reported.
+
+        Returns:
+            - list: Pairs of statement shape and number of executions, most repeated first.
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
@@ -0,0 +1,95 @@
+import warnings
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .mixins import QueryBudgetAdminMixin, QueryBudgetExceeded, QueryBudgetWarning
+from .recorder import normalize_sql, QueryRecorder
+
+
+class QueryBudgetUserAdmin(QueryBudgetAdminMixin, admin.ModelAdmin):
+    query_budget = {'changelist': 3}
+
+
+def per_row_view():
+    """
+    A view loading the users, then their groups one user at a time.
+    """
+    for user in User.objects.order_by('pk'):
+        list(user.groups.all())
+    return HttpResponse()
+
+
+def batched_view():
+    """
+    A view loading the users and their groups in two queries.
+    """
+    list(User.objects.prefetch_related('groups'))
+    return HttpResponse()
+
+
+class NormalizeSqlTests(SimpleTestCase):
+
+    def test_parameters_are_stripped(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id = 42 AND name = 'it''s'"),
+            'SELECT * FROM t WHERE id = %s AND name = %s',
+        )
+
+    def test_placeholder_lists_of_any_length_are_collapsed(self):
+        self.assertEqual(
+            normalize_sql('SELECT * FROM t WHERE id IN (%s, %s)'),
+            normalize_sql('SELECT * FROM t WHERE id IN (%s, %s, %s, %s)'),
+        )
+
+
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create([User(username=f'user{i}') for i in range(6)])
+
+    def setUp(self):
+        self.model_admin = QueryBudgetUserAdmin(User, admin.AdminSite())
+
+    def test_per_row_queries_are_grouped_by_shape(self):
+        recorder = QueryRecorder()
+        with recorder.record():
+            per_row_view()
+        self.assertEqual(recorder.count, 7)
+        repeated = recorder.get_repeated_shapes(self.model_admin.query_repeat_threshold)
+        self.assertEqual(len(repeated), 1)
+        shape, count = repeated[0]
+        self.assertEqual(count, 6)
+        self.assertIn('auth_user_groups', shape)
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_strict_mode_raises(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'likely an N+1 pattern'):
+            self.model_admin.run_with_query_budget('changelist', per_row_view)
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_strict_mode_raises_over_budget(self):
+        self.model_admin.query_budget = {'history': 1}
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'exceeding its budget of 1'):
+            self.model_admin.run_with_query_budget('history', batched_view)
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_batched_queries_pass(self):
+        self.model_admin.run_with_query_budget('changelist', batched_view)
+
+    @override_settings(DEBUG=True)
+    def test_debug_warns(self):
+        with self.assertLogs('admin.p8_query_budget.mixins', 'WARNING'), warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.model_admin.run_with_query_budget('changelist', per_row_view)
+        self.assertEqual([warning.category for warning in caught], [QueryBudgetWarning, QueryBudgetWarning])
+        self.assertIn('exceeding its budget of 3', str(caught[0].message))
+        self.assertIn('likely an N+1 pattern', str(caught[1].message))
+
+    def test_nothing_is_recorded_outside_debug(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', QueryBudgetWarning)
+            self.model_admin.run_with_query_budget('changelist', per_row_view)
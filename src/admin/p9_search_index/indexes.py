@@ -0,0 +1,385 @@
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from django.contrib.admin.utils import get_fields_from_path
+from django.db import connections, models, router, transaction
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ObjectDoesNotExist
+from django.utils.translation import gettext_lazy as _
+
+
+#: Matches the words of a search term, punctuation is dropped so it can't be interpreted by the index query syntax.
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def get_field_path(model, search_field: str) -> str:
+    """
+    Reduces an admin search field to the field path it searches, dropping the prefix and the trailing lookups like
+    Django's `construct_search`, e.g. `^author__name__iexact` becomes `author__name`.
+
+    Args:
+        - model: The model class searched.
+        - search_field (str): The entry of `search_fields`.
+
+    Returns:
+        - str: The field path.
+
+    Raises:
+        - ImproperlyConfigured: If the entry doesn't start with a field of the model.
+    """
+    opts, parts = model._meta, []
+    for part in search_field.lstrip('^=@').split(LOOKUP_SEP):
+        if part == 'pk':
+            part = opts.pk.name
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            # The remaining parts are lookups
+            break
+        parts.append(part)
+        if hasattr(field, 'path_infos'):
+            opts = field.path_infos[-1].to_opts
+    if not parts:
+        raise ImproperlyConfigured(_('Search field %(field)r is not a field of %(model)s.') % {
+            'field': search_field, 'model': model._meta.label,
+        })
+    return LOOKUP_SEP.join(parts)
+
+
+class BaseSearchIndex:
+    """
+    Base class of a full-text index kept next to a model's table.
+
+    The index lives in a side table keyed by the model's integer primary key, holding the text of the indexed field
+    paths (which may traverse relations, e.g. `author__name`). Subclasses implement the backend specific DDL, the
+    writes and the match query. The index table is only created by `rebuild`, which fills it in the same transaction,
+    so an existing table is a complete index. Once built, it is kept in sync by `update` and `remove`, usually called
+    from `post_save` and `post_delete` receivers.
+    """
+    #: The database vendor supported by the index.
+    vendor = None
+    #: The suffix appended to the model's table name to build the index table name.
+    table_suffix = '_search'
+
+    def __init__(self, model, fields: Iterable[str]) -> None:
+        """
+        Initializes the index of a model.
+
+        Args:
+            - model: The model class to index.
+            - fields (Iterable[str]): The field paths to index, admin search prefixes (`^`, `=`, `@`) and trailing
+              lookups (e.g. `__iexact`) are ignored.
+
+        Raises:
+            - ImproperlyConfigured: If the model's primary key isn't an integer, or a field path is invalid.
+        """
+        if not isinstance(model._meta.pk, (models.AutoField, models.BigAutoField, models.IntegerField)):
+            raise ImproperlyConfigured(_('Search indexes require an integer primary key.'))
+        self.model = model
+        self.fields = tuple(dict.fromkeys(get_field_path(model, field) for field in fields))
+        self.using = router.db_for_write(model)
+        self.table = model._meta.db_table + self.table_suffix
+        self.built = False
+
+    @property
+    def connection(self):
+        """
+        Returns the connection of the database holding the model's table.
+
+        Returns:
+            - BaseDatabaseWrapper: The database connection.
+        """
+        return connections[self.using]
+
+    def quote(self, name: str) -> str:
+        """
+        Quotes a table or column name for the current backend.
+
+        Args:
+            - name (str): The name to quote.
+
+        Returns:
+            - str: The quoted name.
+        """
+        return self.connection.ops.quote_name(name)
+
+    def get_path_values(self, value, attrs: List[str]) -> List[str]:
+        """
+        Follows the remaining attributes of a field path, through every instance of multi-valued relations.
+
+        Args:
+            - value: The instance the attributes are read from.
+            - attrs (list): The remaining attributes of the path.
+
+        Returns:
+            - list: The text of every value reached, none for missing values.
+        """
+        for index, attr in enumerate(attrs):
+            try:
+                value = getattr(value, attr, None)
+            except ObjectDoesNotExist:
+                # The related instance is being deleted in the same transaction
+                value = None
+            if value is None:
+                return []
+            if isinstance(value, models.Manager):
+                # Many-to-many and reverse relations, e.g. `tags__name`, contribute every related instance
+                return [text for related in value.all() for text in self.get_path_values(related, attrs[index + 1:])]
+        return [str(value)]
+
+    def get_document(self, obj) -> List[str]:
+        """
+        Reads the text of the indexed field paths from an instance.
+
+        Args:
+            - obj (Model instance): The instance to index.
+
+        Returns:
+            - list: One string per indexed field path, the values of multi-valued paths joined by spaces, empty for
+              missing values.
+        """
+        return [' '.join(self.get_path_values(obj, path.split(LOOKUP_SEP))) for path in self.fields]
+
+    def get_words(self, search_term: str) -> List[str]:
+        """
+        Splits a search term into the words matched against the index.
+
+        Args:
+            - search_term (str): The term typed in the admin search box.
+
+        Returns:
+            - list: The words of the term.
+        """
+        return WORD_RE.findall(search_term)
+
+    def get_dependencies(self) -> List[Tuple[type, str]]:
+        """
+        Lists the related models traversed by the indexed field paths, whose changes alter the indexed text.
+
+        Returns:
+            - list: Pairs of related model and the lookup selecting the indexed rows from one of its instances, e.g.
+              `(Author, 'author')` for `author__name`.
+        """
+        dependencies = []
+        for path in self.fields:
+            parts = path.split(LOOKUP_SEP)
+            for index, field in enumerate(get_fields_from_path(self.model, path)[:-1]):
+                dependency = (field.related_model, LOOKUP_SEP.join(parts[:index + 1]))
+                if dependency not in dependencies:
+                    dependencies.append(dependency)
+        return dependencies
+
+    def get_m2m_through_models(self) -> List[type]:
+        """
+        Lists the intermediate models of the many-to-many relations traversed by the indexed field paths, whose
+        `m2m_changed` signals alter the indexed text.
+
+        Returns:
+            - list: The through models.
+        """
+        through_models = []
+        for path in self.fields:
+            for field in get_fields_from_path(self.model, path):
+                if field.many_to_many:
+                    through = getattr(field, 'through', None) or field.remote_field.through
+                    if through not in through_models:
+                        through_models.append(through)
+        return through_models
+
+    def is_built(self) -> bool:
+        """
+        Checks whether the index was built by `rebuild`, the answer is only cached once it is.
+
+        Returns:
+            - bool: `True` if the index table exists.
+        """
+        if not self.built:
+            with self.connection.cursor() as cursor:
+                self.built = self.table in self.connection.introspection.table_names(cursor)
+        return self.built
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """
+        Creates the index table if needed and indexes every row of the model, replacing the current content of the
+        index in a single transaction.
+
+        Args:
+            - batch_size (int, optional): The number of rows loaded per query. Defaults to 1000.
+
+        Returns:
+            - int: The number of indexed rows.
+        """
+        count = 0
+        with transaction.atomic(using=self.using):
+            with self.connection.cursor() as cursor:
+                for statement in self.get_create_statements():
+                    cursor.execute(statement)
+                cursor.execute(f'DELETE FROM {self.quote(self.table)}')
+            self.built = True
+            queryset = self.model._default_manager.using(self.using).all()
+            for obj in queryset.iterator(chunk_size=batch_size):
+                self.update(obj)
+                count += 1
+        return count
+
+    def update_related(self, lookup: str, value) -> None:
+        """
+        Re-indexes the rows whose indexed text goes through a related instance.
+
+        Args:
+            - lookup (str): The lookup of the relation, as returned by `get_dependencies`.
+            - value: The related instance, or a list of primary keys of the rows with an `in` lookup.
+        """
+        if not self.is_built():
+            return
+        queryset = self.model._default_manager.using(self.using).filter(**{lookup: value})
+        for obj in queryset.iterator():
+            self.update(obj)
+
+    def remove(self, pk) -> None:
+        """
+        Removes a row from the index.
+
+        Args:
+            - pk: The primary key of the removed row.
+        """
+        raise NotImplementedError
+
+    def update(self, obj) -> None:
+        """
+        Inserts or replaces the indexed text of a row.
+
+        Args:
+            - obj (Model instance): The saved instance.
+        """
+        raise NotImplementedError
+
+    def get_create_statements(self) -> List[str]:
+        """
+        Returns the DDL statements creating the index table, they must be idempotent.
+
+        Returns:
+            - list: The SQL statements.
+        """
+        raise NotImplementedError
+
+    def match(self, search_term: str) -> Optional[RawSQL]:
+        """
+        Builds the subquery selecting the primary keys of the rows matching a search term.
+
+        Args:
+            - search_term (str): The term typed in the admin search box.
+
+        Returns:
+            - RawSQL or None: The subquery, usable with `pk__in`, or None if the term has no words.
+        """
+        raise NotImplementedError
+
+
+class SQLiteSearchIndex(BaseSearchIndex):
+    """
+    A search index stored in an SQLite FTS5 virtual table, whose rowid is the model's primary key.
+
+    Every word of the search term must match the prefix of a token of any indexed field.
+    """
+    vendor = 'sqlite'
+    table_suffix = '_fts'
+
+    def get_create_statements(self) -> List[str]:
+        columns = ', '.join(self.quote(field) for field in self.fields)
+        return [f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.quote(self.table)} USING fts5({columns})"]
+
+    def remove(self, pk) -> None:
+        if not self.is_built():
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.quote(self.table)} WHERE rowid = %s', [pk])
+
+    def update(self, obj) -> None:
+        if not self.is_built():
+            return
+        columns = ', '.join(self.quote(field) for field in self.fields)
+        placeholders = ', '.join(['%s'] * len(self.fields))
+        with self.connection.cursor() as cursor:
+            # FTS5 has no upsert, delete the previous version of the row first
+            cursor.execute(f'DELETE FROM {self.quote(self.table)} WHERE rowid = %s', [obj.pk])
+            cursor.execute(
+                f'INSERT INTO {self.quote(self.table)} (rowid, {columns}) VALUES (%s, {placeholders})',
+                [obj.pk, *self.get_document(obj)],
+            )
+
+    def match(self, search_term: str) -> Optional[RawSQL]:
+        words = self.get_words(search_term)
+        if not words:
+            return None
+        # Quoted words are taken literally by the FTS5 query syntax, the trailing * makes them prefix queries
+        query = ' '.join(f'"{word}"*' for word in words)
+        return RawSQL(f'SELECT rowid FROM {self.quote(self.table)} WHERE {self.quote(self.table)} MATCH %s', [query])
+
+
+class PostgreSQLSearchIndex(BaseSearchIndex):
+    """
+    A search index stored in a side table holding a `tsvector` column with a GIN index.
+
+    Every word of the search term must match the prefix of a lexeme of any indexed field.
+    """
+    vendor = 'postgresql'
+    #: The text search configuration used to build the documents and the queries.
+    config = 'simple'
+
+    def get_create_statements(self) -> List[str]:
+        table = self.quote(self.table)
+        return [
+            f'CREATE TABLE IF NOT EXISTS {table} (id bigint PRIMARY KEY, document tsvector NOT NULL)',
+            f'CREATE INDEX IF NOT EXISTS {self.quote(self.table + "_gin")} ON {table} USING GIN (document)',
+        ]
+
+    def remove(self, pk) -> None:
+        if not self.is_built():
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.quote(self.table)} WHERE id = %s', [pk])
+
+    def update(self, obj) -> None:
+        if not self.is_built():
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.quote(self.table)} (id, document) VALUES (%s, to_tsvector(%s::regconfig, %s)) '
+                f'ON CONFLICT (id) DO UPDATE SET document = EXCLUDED.document',
+                [obj.pk, self.config, ' '.join(self.get_document(obj))],
+            )
+
+    def match(self, search_term: str) -> Optional[RawSQL]:
+        words = self.get_words(search_term)
+        if not words:
+            return None
+        query = ' & '.join(f'{word}:*' for word in words)
+        return RawSQL(
+            f'SELECT id FROM {self.quote(self.table)} WHERE document @@ to_tsquery(%s::regconfig, %s)',
+            [self.config, query],
+        )
+
+
+#: The search index classes by database vendor.
+SEARCH_INDEX_CLASSES = {
+    SQLiteSearchIndex.vendor: SQLiteSearchIndex,
+    PostgreSQLSearchIndex.vendor: PostgreSQLSearchIndex,
+}
+
+
+def get_search_index(model, fields: Iterable[str]) -> Optional[BaseSearchIndex]:
+    """
+    Returns the search index matching the database backend of a model.
+
+    Args:
+        - model: The model class to index.
+        - fields (Iterable[str]): The field paths to index.
+
+    Returns:
+        - BaseSearchIndex or None: The index, or None if the backend has no full-text index support.
+    """
+    vendor = connections[router.db_for_write(model)].vendor
+    index_class = SEARCH_INDEX_CLASSES.get(vendor)
+    return index_class(model, fields) if index_class else None
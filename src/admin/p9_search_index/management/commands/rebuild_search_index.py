@@ -0,0 +1,58 @@
+from django.apps import apps
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+
+from admin.p9_search_index.mixins import SearchIndexAdminMixin
+
+
+class Command(BaseCommand):
+    help = (
+        'Builds or rebuilds the full-text search indexes of the admins using SearchIndexAdminMixin. Until an index is '
+        'built, the changelist search of its model falls back to the default icontains search.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help='Model labels, e.g. shop.Book. Defaults to every indexed model.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='The number of rows loaded per query.')
+
+    def get_model_admins(self, labels):
+        """
+        Returns the registered admins whose search index is rebuilt.
+
+        Args:
+            - labels (list): The labels of the requested models, empty for every indexed model.
+
+        Returns:
+            - list: The admins using `SearchIndexAdminMixin` with a search index.
+
+        Raises:
+            - CommandError: If a requested model is unknown or has no admin with a search index.
+        """
+        model_admins = [
+            model_admin for model_admin in admin.site._registry.values()
+            if isinstance(model_admin, SearchIndexAdminMixin) and model_admin.search_index is not None
+        ]
+        if not labels:
+            return model_admins
+
+        selected = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as error:
+                raise CommandError(error)
+            model_admin = next((model_admin for model_admin in model_admins if model_admin.model is model), None)
+            if model_admin is None:
+                raise CommandError(f'{model._meta.label} has no admin with a search index.')
+            selected.append(model_admin)
+        return selected
+
+    def handle(self, *args, **options):
+        model_admins = self.get_model_admins(options['models'])
+        if not model_admins:
+            self.stdout.write('No search indexes to rebuild.')
+            return
+
+        for model_admin in model_admins:
+            count = model_admin.search_index.rebuild(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} {model_admin.opts.label} rows.'))
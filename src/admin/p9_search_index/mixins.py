@@ -0,0 +1,264 @@
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from models.p1_signal_enhanced.signals import post_bulk_create, post_bulk_update, post_bulk_delete
+
+from .indexes import get_search_index
+
+
+class SearchIndexAdminMixin:
+    """
+    A mixin for Django admin classes that answers changelist searches from a full-text index.
+
+    Django compiles `search_fields` into one `icontains` per field and word, which scans the whole table. This mixin
+    keeps a full-text index of the same fields (an FTS5 virtual table on SQLite, a `tsvector` column with a GIN index
+    on PostgreSQL) in sync through `post_save` and `post_delete` receivers, and the bulk signals of
+    `SignalEnhancedQuerySetMixins`, and rewrites the changelist search into a primary key lookup against that index.
+    Rows whose indexed paths go through relations, e.g. `author__name` or `tags__name`, are re-indexed when the related
+    instance is saved, updated in bulk or deleted, or when the many-to-many relation changes. On other backends, and
+    until the index is built with the `rebuild_search_index` command, the default search is kept. The mixin composes
+    with `QuerysetAdminMixin`, which still provides the queryset and its ordering.
+
+    Matching is word based: every word of the search term must be the prefix of a word of any indexed field, unlike
+    `icontains` which also matches in the middle of words.
+    """
+    #: The field paths to index, defaults to `search_fields`.
+    search_index_fields = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the admin, its search index and the receivers keeping the index in sync.
+
+        Args:
+            - *args: Variable length argument list passed to the superclass.
+            - **kwargs: Arbitrary keyword arguments passed to the superclass.
+        """
+        super().__init__(*args, **kwargs)
+        fields = self.search_index_fields or self.search_fields
+        self.search_index = get_search_index(self.model, fields) if fields else None
+        if self.search_index is not None:
+            dispatch_uid = f'search-index:{self.opts.label_lower}'
+            receivers = (
+                (post_save, self.index_saved_object),
+                (post_delete, self.unindex_deleted_object),
+                (post_bulk_create, self.index_created_objects),
+                (post_bulk_update, self.index_updated_objects),
+                (post_bulk_delete, self.unindex_deleted_objects),
+            )
+            for signal, receiver in receivers:
+                signal.connect(receiver, sender=self.model, weak=False, dispatch_uid=dispatch_uid)
+            #: Maps the related models of the indexed paths to the lookups selecting the rows depending on them.
+            self.search_index_dependencies = {}
+            for model, lookup in self.search_index.get_dependencies():
+                self.search_index_dependencies.setdefault(model, []).append(lookup)
+            dispatch_uid = f'search-index-dependency:{self.opts.label_lower}'
+            for model in self.search_index_dependencies:
+                post_save.connect(self.reindex_related_objects, sender=model, weak=False, dispatch_uid=dispatch_uid)
+                pre_delete.connect(self.collect_related_objects, sender=model, weak=False, dispatch_uid=dispatch_uid)
+                post_delete.connect(
+                    self.reindex_collected_objects, sender=model, weak=False, dispatch_uid=dispatch_uid,
+                )
+                post_bulk_update.connect(
+                    self.reindex_related_updated_objects, sender=model, weak=False, dispatch_uid=dispatch_uid,
+                )
+            for through in self.search_index.get_m2m_through_models():
+                m2m_changed.connect(self.reindex_m2m_changed, sender=through, weak=False, dispatch_uid=dispatch_uid)
+
+    def index_saved_object(self, sender, instance, **kwargs) -> None:
+        """
+        Signal receiver updating the index entry of a saved instance.
+
+        Args:
+            - sender: The model class sending the signal.
+            - instance (Model instance): The saved instance.
+            - **kwargs: The remaining signal arguments.
+        """
+        self.search_index.update(instance)
+
+    def unindex_deleted_object(self, sender, instance, **kwargs) -> None:
+        """
+        Signal receiver removing the index entry of a deleted instance.
+
+        Args:
+            - sender: The model class sending the signal.
+            - instance (Model instance): The deleted instance.
+            - **kwargs: The remaining signal arguments.
+        """
+        self.search_index.remove(instance.pk)
+
+    def index_created_objects(self, sender, instances, **kwargs) -> None:
+        """
+        Signal receiver indexing the instances of a `bulk_create` batch.
+
+        Args:
+            - sender: The model class sending the signal.
+            - instances (list): The created instances, those without a primary key weren't inserted.
+            - **kwargs: The remaining signal arguments.
+        """
+        if self.search_index.is_built():
+            for instance in instances:
+                if instance.pk is not None:
+                    self.search_index.update(instance)
+
+    def index_updated_objects(self, sender, pks, **kwargs) -> None:
+        """
+        Signal receiver re-indexing the rows of an `update` or `bulk_update` batch, re-read from the database since
+        the instances may hold expressions rather than the stored values.
+
+        Args:
+            - sender: The model class sending the signal.
+            - pks (list): The primary keys of the updated rows.
+            - **kwargs: The remaining signal arguments.
+        """
+        self.search_index.update_related('pk__in', pks)
+
+    def unindex_deleted_objects(self, sender, pks, **kwargs) -> None:
+        """
+        Signal receiver removing the index entries of a `delete` batch.
+
+        Args:
+            - sender: The model class sending the signal.
+            - pks (list): The primary keys of the deleted rows.
+            - **kwargs: The remaining signal arguments.
+        """
+        if self.search_index.is_built():
+            for pk in pks:
+                self.search_index.remove(pk)
+
+    def get_dependent_pks(self, model, pks) -> list:
+        """
+        Returns the primary keys of the indexed rows reaching instances of a model through their indexed paths.
+
+        Args:
+            - model: The model class of the instances, the indexed model itself or a related model.
+            - pks (Iterable): The primary keys of the instances.
+
+        Returns:
+            - list: The primary keys of the indexed rows.
+        """
+        pks = list(pks)
+        if issubclass(model, self.model):
+            return pks
+        manager = self.model._default_manager.using(self.search_index.using)
+        return list({
+            pk for lookup in self.search_index_dependencies.get(model, ())
+            for pk in manager.filter(**{f'{lookup}__in': pks}).values_list('pk', flat=True)
+        })
+
+    def get_relation_depth(self, model) -> float:
+        """
+        Returns how many relations separate a model from the indexed model along the indexed paths.
+
+        Args:
+            - model: The model class.
+
+        Returns:
+            - float: 0 for the indexed model, the length of its shortest lookup for a related model, infinity otherwise.
+        """
+        if issubclass(model, self.model):
+            return 0
+        lookups = self.search_index_dependencies.get(model, ())
+        return min((len(lookup.split(LOOKUP_SEP)) for lookup in lookups), default=float('inf'))
+
+    def reindex_related_updated_objects(self, sender, pks, **kwargs) -> None:
+        """
+        Signal receiver re-indexing the rows displaying the related instances of an `update` or `bulk_update` batch.
+
+        Args:
+            - sender: The related model class sending the signal.
+            - pks (list): The primary keys of the updated related rows.
+            - **kwargs: The remaining signal arguments.
+        """
+        if self.search_index.is_built():
+            self.search_index.update_related('pk__in', self.get_dependent_pks(sender, pks))
+
+    def reindex_m2m_changed(self, sender, instance, action, model, pk_set, **kwargs) -> None:
+        """
+        Signal receiver re-indexing the rows affected by a change of a many-to-many relation of an indexed path,
+        from either side of the relation.
+
+        Rows are selected through the side of the relation closest to the indexed model, e.g. adding a user to a
+        group only re-indexes that user, not every member of the group.
+
+        Args:
+            - sender: The intermediate model of the relation.
+            - instance (Model instance): The instance whose relation changed.
+            - action (str): The kind of change, e.g. `post_add`.
+            - model: The model class of the added, removed or cleared instances.
+            - pk_set (set): The primary keys of the added or removed instances, None when cleared.
+            - **kwargs: The remaining signal arguments.
+        """
+        if not self.search_index.is_built():
+            return
+        if action == 'pre_clear':
+            # The cleared instances can't be followed afterwards, remember the rows reaching them through the instance
+            instance._search_index_pks = self.get_dependent_pks(type(instance), [instance.pk])
+            return
+        if action == 'post_clear':
+            pks = instance.__dict__.pop('_search_index_pks', ())
+        elif action in ('post_add', 'post_remove'):
+            if self.get_relation_depth(type(instance)) <= self.get_relation_depth(model):
+                pks = self.get_dependent_pks(type(instance), [instance.pk])
+            else:
+                pks = self.get_dependent_pks(model, pk_set)
+        else:
+            return
+        if pks:
+            self.search_index.update_related('pk__in', pks)
+
+    def reindex_related_objects(self, sender, instance, **kwargs) -> None:
+        """
+        Signal receiver re-indexing the rows displaying a saved related instance through their indexed paths.
+
+        Args:
+            - sender: The related model class sending the signal.
+            - instance (Model instance): The saved related instance.
+            - **kwargs: The remaining signal arguments.
+        """
+        for lookup in self.search_index_dependencies[sender]:
+            self.search_index.update_related(lookup, instance)
+
+    def collect_related_objects(self, sender, instance, **kwargs) -> None:
+        """
+        Signal receiver remembering the rows depending on a related instance about to be deleted, since relations
+        set to null on delete can't be followed anymore afterwards.
+
+        Args:
+            - sender: The related model class sending the signal.
+            - instance (Model instance): The related instance being deleted.
+            - **kwargs: The remaining signal arguments.
+        """
+        if self.search_index.is_built():
+            instance._search_index_pks = self.get_dependent_pks(sender, [instance.pk])
+
+    def reindex_collected_objects(self, sender, instance, **kwargs) -> None:
+        """
+        Signal receiver re-indexing the rows remembered by `collect_related_objects` once the deletion is done.
+
+        Args:
+            - sender: The related model class sending the signal.
+            - instance (Model instance): The deleted related instance.
+            - **kwargs: The remaining signal arguments.
+        """
+        pks = instance.__dict__.pop('_search_index_pks', None)
+        if pks:
+            self.search_index.update_related('pk__in', pks)
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Filters the changelist queryset with the full-text index, or with the default search until it is built.
+
+        Args:
+            - request (HttpRequest): The request object.
+            - queryset (QuerySet): The queryset to filter.
+            - search_term (str): The term typed in the admin search box.
+
+        Returns:
+            - tuple: The filtered queryset, and whether it may contain duplicates (never, with the index).
+        """
+        if self.search_index is None or not self.search_index.is_built():
+            return super().get_search_results(request, queryset, search_term)
+        match = self.search_index.match(search_term)
+        if match is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=match), False
@@ -0,0 +1,83 @@
+from django.contrib import admin
+from django.contrib.auth.models import Group, User
+from django.db import models
+from django.test import RequestFactory, TestCase
+
+from models.p1_signal_enhanced.mixins import SignalEnhancedQuerySetMixins
+
+from .mixins import SearchIndexAdminMixin
+
+
+class SignalEnhancedUserQuerySet(SignalEnhancedQuerySetMixins, models.QuerySet):
+    #: Only the bulk signals are sent, so the index must be kept in sync by them alone.
+    send_row_signals = False
+
+
+class SearchUserAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
+    search_fields = ('username', 'first_name__iexact', 'groups__name')
+
+
+#: Built once, its receivers stay connected for the whole process.
+model_admin = SearchUserAdmin(User, admin.AdminSite())
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        # The index table of a previous test was rolled back with its transaction, and must not outlive this one
+        model_admin.search_index.built = False
+        self.addCleanup(setattr, model_admin.search_index, 'built', False)
+        self.editors = Group.objects.create(name='Editors')
+        self.alice = User.objects.create(username='alice', first_name='Alice')
+        self.alice.groups.add(self.editors)
+        User.objects.create(username='bob', first_name='Bob')
+
+    def search(self, search_term: str) -> list:
+        request = RequestFactory().get('/')
+        queryset, _ = model_admin.get_search_results(request, User.objects.all(), search_term)
+        return sorted(queryset.values_list('username', flat=True))
+
+    def test_lookups_are_stripped_from_search_fields(self):
+        self.assertEqual(model_admin.search_index.fields, ('username', 'first_name', 'groups__name'))
+
+    def test_default_search_until_built(self):
+        # icontains matches inside words, the index only matches word prefixes
+        self.assertEqual(self.search('lic'), ['alice'])
+        model_admin.search_index.rebuild()
+        self.assertEqual(self.search('lic'), [])
+
+    def test_search_through_many_to_many_path(self):
+        model_admin.search_index.rebuild()
+        self.assertEqual(self.search('edit'), ['alice'])
+
+    def test_many_to_many_changes_reindex_rows(self):
+        model_admin.search_index.rebuild()
+        bob = User.objects.get(username='bob')
+        bob.groups.add(self.editors)
+        self.assertEqual(self.search('edit'), ['alice', 'bob'])
+        self.editors.user_set.remove(self.alice)
+        self.assertEqual(self.search('edit'), ['bob'])
+        self.editors.user_set.clear()
+        self.assertEqual(self.search('edit'), [])
+
+    def test_related_changes_reindex_rows(self):
+        model_admin.search_index.rebuild()
+        self.editors.name = 'Reviewers'
+        self.editors.save()
+        self.assertEqual(self.search('review'), ['alice'])
+        self.editors.delete()
+        self.assertEqual(self.search('review'), [])
+
+    def test_bulk_signals_keep_the_index_in_sync(self):
+        model_admin.search_index.rebuild()
+        queryset = SignalEnhancedUserQuerySet(User)
+        queryset.bulk_create([User(username='carol'), User(username='dave')])
+        self.assertEqual(self.search('carol'), ['carol'])
+        queryset.filter(username='dave').update(first_name='Zed')
+        self.assertEqual(self.search('zed'), ['dave'])
+        carol = User.objects.get(username='carol')
+        carol.first_name = 'Yolanda'
+        queryset.bulk_update([carol], ['first_name'])
+        self.assertEqual(self.search('yolanda'), ['carol'])
+        queryset.filter(username__in=['carol', 'dave']).delete()
+        self.assertEqual(self.search('carol'), [])
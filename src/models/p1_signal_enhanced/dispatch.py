@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+
+
+logger = logging.getLogger(__name__)
+
+#: The shared pool running the thread-safe deferred receivers, created on first use.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def thread_safe_receiver(func: Callable) -> Callable:
+    """
+    Decorator marking a receiver as safe to run on the signal thread pool when its signals are deferred.
+
+    Args:
+        - func (Callable): The receiver.
+
+    Returns:
+        - Callable: The same receiver.
+    """
+    func.thread_safe = True
+    return func
+
+
+def get_signal_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool running the thread-safe deferred receivers.
+
+    Returns:
+        - ThreadPoolExecutor: A pool of `SIGNAL_THREAD_POOL_SIZE` threads, 4 by default.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'SIGNAL_THREAD_POOL_SIZE', 4),
+                thread_name_prefix='signal-dispatch',
+            )
+        return _executor
+
+
+def get_receivers(signal: Signal, sender) -> List[Callable]:
+    """
+    Returns the live receivers of a signal for a sender.
+
+    Args:
+        - signal (Signal): The signal.
+        - sender: The sender, usually a model class.
+
+    Returns:
+        - list: The receiver callables, async receivers wrapped to be called synchronously.
+    """
+    receivers = signal._live_receivers(sender)
+    # Django 5 returns the sync and async receivers separately
+    if isinstance(receivers, tuple):
+        sync_receivers, async_receivers = receivers
+        receivers = [*sync_receivers, *(async_to_sync(receiver) for receiver in async_receivers)]
+    return receivers
+
+
+def call_receiver(receiver: Callable, signal: Signal, kwargs: dict, profiler=None) -> None:
+    """
+    Calls a deferred receiver, logging its duration and any error it raises without affecting the other receivers.
+
+    Args:
+        - receiver (Callable): The receiver.
+        - signal (Signal): The signal being dispatched.
+        - kwargs (dict): The signal arguments, the sender included.
+        - profiler (SignalProfiler, optional): The profiler recording the call. Defaults to None.
+    """
+    name = getattr(receiver, '__qualname__', repr(receiver))
+    start = time.perf_counter()
+    try:
+        receiver(signal=signal, **kwargs)
+    except Exception:
+        logger.exception('Deferred signal receiver %s failed', name)
+    finally:
+        duration = time.perf_counter() - start
+        logger.debug('Deferred signal receiver %s took %.1f ms', name, duration * 1000)
+        if profiler is not None:
+            profiler.record(signal, kwargs['sender'], receiver, duration)
+
+
+def call_receiver_in_pool(receiver: Callable, signal: Signal, kwargs: dict, profiler=None) -> None:
+    """
+    Calls a deferred receiver on a pool thread, then closes the database connections it opened in that thread.
+
+    Args:
+        - receiver (Callable): The receiver.
+        - signal (Signal): The signal being dispatched.
+        - kwargs (dict): The signal arguments, the sender included.
+        - profiler (SignalProfiler, optional): The profiler recording the call. Defaults to None.
+    """
+    try:
+        call_receiver(receiver, signal, kwargs, profiler)
+    finally:
+        connections.close_all()
+
+
+def dispatch_signals(payloads: List[Tuple[Signal, dict]], thread_pool: bool = False, profiler=None) -> None:
+    """
+    Sends collected signal payloads, receiver by receiver.
+
+    Args:
+        - payloads (list): Pairs of signal and arguments, the sender included, in sending order.
+        - thread_pool (bool, optional): Whether receivers marked with `thread_safe_receiver` run on the signal thread
+          pool. Defaults to False.
+        - profiler (SignalProfiler, optional): The profiler recording the receiver calls. Defaults to None.
+    """
+    for signal, kwargs in payloads:
+        for receiver in get_receivers(signal, kwargs['sender']):
+            if thread_pool and getattr(receiver, 'thread_safe', False):
+                get_signal_executor().submit(call_receiver_in_pool, receiver, signal, kwargs, profiler)
+            else:
+                call_receiver(receiver, signal, kwargs, profiler)
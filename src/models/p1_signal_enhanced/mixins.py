@@ -1,17 +1,359 @@
-from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from contextlib import nullcontext
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save
+
+from .dispatch import dispatch_signals
+from .profiling import profiled_operation, SignalProfiler
+from .signals import (
+    pre_bulk_create, post_bulk_create, pre_bulk_update, post_bulk_update, pre_bulk_delete, post_bulk_delete,
+)
 
 
 class SignalEnhancedQuerySetMixins:
     """
     Custom QuerySet that sends signals for bulk delete and update operations.
 
-    This QuerySet overrides the default delete and update methods to ensure that Django's `pre_delete`, `post_delete`
-    & `pre_save`, `post_save` signals are sent for each object in the queryset.
+    This QuerySet overrides the default update method to ensure that Django's `pre_save` and `post_save` signals are
+    sent for each object in the queryset. The `pre_delete` and `post_delete` signals of each deleted object are sent by
+    Django's deletion collector itself, the mixin adds the bulk delete signals around it.
+
+    By default the whole queryset is loaded, then changed by a single statement. Call `chunked()` first to walk the
+    queryset by primary key batches instead, each batch sending its signals and running its own statement, optionally
+    in its own transaction, so memory use and lock duration are bounded by the batch size.
+
+    `bulk_create` and `bulk_update` send the same signals as `save()` for each instance, plus the bulk create or
+    update signals once per batch, while keeping their batched statements.
+
+    Each statement also sends `pre_bulk_update`/`post_bulk_update` or `pre_bulk_delete`/`post_bulk_delete` once, with
+    the instances and primary keys of the whole batch, which is far cheaper to dispatch than one signal per row. Set
+    `send_row_signals` to False to only send these. No signal is sent, and nothing is loaded for them, when no receiver
+    is connected.
     """
+    #: Whether `pre_save` and `post_save` are sent for each created or updated row, the bulk signals are always sent.
+    send_row_signals = True
+    #: The profiler timing the receivers of the signals sent by the queryset, None when profiling is off.
+    signal_profiler = None
+    #: Whether the queryset sends signals at all, turned off for the statements Django issues on the mixin's behalf.
+    send_signals = True
+    #: Whether the post-signals of each batch are sent after its transaction commits rather than inline.
+    defer_post_signals = False
+    #: Whether deferred receivers marked with `thread_safe_receiver` run on the signal thread pool.
+    signal_thread_pool = False
+    #: Whether the updated columns are re-read after an update, so post-signal receivers see the stored values. None
+    #: re-reads them only when a value is an expression, e.g. `F('count') + 1`, which can't be applied in Python.
+    refresh_after_update = None
+    #: Whether updates skip the rows already holding the new values, in the statement and in the signals.
+    only_changed_rows = False
+    #: The number of objects per batch, None processes the whole queryset at once.
+    chunk_size = None
+    #: Whether each batch runs in its own transaction.
+    chunk_atomic = True
+
+    def _clone(self):
+        """
+        Copies the chunked mode settings to the cloned queryset.
+
+        Returns:
+            - QuerySet: The cloned queryset.
+        """
+        clone = super()._clone()
+        clone.chunk_size = self.chunk_size
+        clone.chunk_atomic = self.chunk_atomic
+        clone.only_changed_rows = self.only_changed_rows
+        clone.defer_post_signals = self.defer_post_signals
+        clone.signal_thread_pool = self.signal_thread_pool
+        clone.send_signals = self.send_signals
+        clone.signal_profiler = self.signal_profiler
+        return clone
+
+    def profiled(self, profiler: SignalProfiler = None):
+        """
+        Returns a copy of the queryset timing each receiver of the signals it sends, and logging the statistics after
+        each `update`, `delete`, `bulk_create` and `bulk_update`.
+
+        Args:
+            - profiler (SignalProfiler, optional): The profiler to record into, e.g. to accumulate statistics over
+              several operations. Defaults to a new profiler.
+
+        Returns:
+            - QuerySet: The profiled queryset.
+        """
+        clone = self._chain()
+        clone.signal_profiler = profiler or SignalProfiler()
+        return clone
+
+    def send_signal(self, signal, **kwargs) -> None:
+        """
+        Sends a signal, through the profiler when profiling is on.
+
+        Args:
+            - signal (Signal): The signal to send.
+            - **kwargs: The signal arguments, the sender included.
+        """
+        if self.signal_profiler is None:
+            signal.send(**kwargs)
+        else:
+            self.signal_profiler.send(signal, **kwargs)
+
+    def without_signals(self):
+        """
+        Returns a copy of the queryset writing like a plain QuerySet, without sending any signal.
+
+        Returns:
+            - QuerySet: The signal-less queryset.
+        """
+        clone = self._chain()
+        clone.send_signals = False
+        return clone
+
+    def deferred(self, thread_pool: bool = False):
+        """
+        Returns a copy of the queryset sending the post-signals of its `update` and `delete` once each batch commits.
+
+        The per-row `pre_delete` and `post_delete` of a delete are not deferred: Django's deletion collector sends them
+        itself, inline, for the deleted rows and their cascades, and offers no hook to divert them short of patching the
+        global signal or copying `Collector.delete`. Receivers needing the committed state should listen to
+        `post_bulk_delete`, whose `instances` are the deleted rows of the batch, or register `transaction.on_commit`
+        callbacks themselves.
+
+        Args:
+            - thread_pool (bool, optional): Whether receivers marked with `thread_safe_receiver` run on the signal
+              thread pool. Defaults to False.
+
+        Returns:
+            - QuerySet: The deferred queryset.
+        """
+        clone = self._chain()
+        clone.defer_post_signals = True
+        clone.signal_thread_pool = thread_pool
+        return clone
+
+    def send_post_signals(self, payloads: list) -> None:
+        """
+        Sends the post-signals of a batch, inline or once the current transaction commits.
+
+        Deferred receivers run after the locks of the batch are released, each one isolated from the errors of the
+        others and timed, and outside any transaction when the batch didn't run in one.
+
+        Args:
+            - payloads (list): Pairs of signal and arguments, the sender included, in sending order.
+        """
+        if not payloads:
+            return
+        if not self.defer_post_signals:
+            for signal, kwargs in payloads:
+                self.send_signal(signal, **kwargs)
+            return
+        transaction.on_commit(
+            partial(dispatch_signals, payloads, self.signal_thread_pool, self.signal_profiler), using=self.db,
+        )
+
+    def only_changed(self):
+        """
+        Returns a copy of the queryset whose `update` only writes and signals the rows it actually changes.
+
+        Returns:
+            - QuerySet: The change-aware queryset.
+        """
+        clone = self._chain()
+        clone.only_changed_rows = True
+        return clone
+
+    def chunked(self, chunk_size: int = 1000, atomic: bool = True):
+        """
+        Returns a copy of the queryset whose `delete` and `update` run in primary key batches.
+
+        Args:
+            - chunk_size (int, optional): The number of objects per batch. Defaults to 1000.
+            - atomic (bool, optional): Whether each batch runs in its own transaction. Defaults to True.
+
+        Returns:
+            - QuerySet: The chunked queryset.
+        """
+        clone = self._chain()
+        clone.chunk_size = chunk_size
+        clone.chunk_atomic = atomic
+        return clone
+
+    def run_in_batches(self, operation) -> list:
+        """
+        Walks the queryset by primary key batches and applies an operation to each.
+
+        Batches are selected by keyset (`pk > last pk of the previous batch`) rather than with an offset, so rows
+        deleted or changed by previous batches don't shift the following ones, and each batch query stays cheap.
+
+        Args:
+            - operation: A callable taking the objects of a batch and the queryset matching them.
+
+        Returns:
+            - list: The results of the operation, one per batch.
+        """
+        queryset = self.order_by('pk')
+        results = []
+        last_pk = None
+        while True:
+            with transaction.atomic(using=self.db) if self.chunk_atomic else nullcontext():
+                # Loading the batch inside the transaction keeps the signals consistent with the statement
+                batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+                objs = list(batch[:self.chunk_size])
+                if not objs:
+                    break
+                results.append(operation(objs, self.filter(pk__in=[obj.pk for obj in objs])))
+            last_pk = objs[-1].pk
+        return results
+
+    def has_signal_receivers(self, *signals) -> bool:
+        """
+        Returns whether any of the signals has a receiver for the queryset's model.
+
+        Args:
+            - *signals (Signal): The signals to check.
+
+        Returns:
+            - bool: True if at least one receiver is connected.
+        """
+        return any(signal.has_listeners(self.model) for signal in signals)
+
+    def delete_objects(self, objs, queryset):
+        """
+        Deletes the objects matched by a queryset, sending the bulk delete signals once for all of them.
+
+        The `pre_delete` and `post_delete` signals of each row are sent by Django's deletion collector itself, which
+        also covers the cascaded objects, inline even in deferred mode.
+
+        Args:
+            - objs (list): The loaded objects of the queryset.
+            - queryset (QuerySet): The queryset deleting them.
 
+        Returns:
+            - tuple: The number of objects deleted and a dictionary with the number of deletions per object type.
+        """
+        pks = [obj.pk for obj in objs]
+
+        # Send the pre_bulk_delete signal once for the batch
+        if pre_bulk_delete.has_listeners(self.model):
+            self.send_signal(pre_bulk_delete, sender=self.model, instances=objs, pks=pks, using=self.db)
+
+        # Delete the objects and get the number of deletions, bypassing this mixin
+        deleted_count = super(SignalEnhancedQuerySetMixins, queryset).delete()
+
+        # Send the post_bulk_delete signal once for the batch
+        if post_bulk_delete.has_listeners(self.model):
+            self.send_post_signals([(
+                post_bulk_delete,
+                dict(sender=self.model, instances=objs, pks=pks, using=self.db, deleted=deleted_count),
+            )])
+
+        return deleted_count
+
+    def update_objects(self, objs, queryset, kwargs: dict) -> int:
+        """
+        Updates the objects matched by a queryset, sending their `pre_save` and `post_save` signals and the bulk update
+        signals once for all of them.
+
+        Args:
+            - objs (list): The loaded objects of the queryset.
+            - queryset (QuerySet): The queryset updating them.
+            - kwargs (dict): The fields to update and their new values.
+
+        Returns:
+            - int: The number of rows updated.
+        """
+        pks = [obj.pk for obj in objs]
+        send_row_signals = self.send_row_signals and self.has_signal_receivers(pre_save, post_save)
+
+        # Send the pre_bulk_update signal once for the batch
+        if pre_bulk_update.has_listeners(self.model):
+            self.send_signal(
+                pre_bulk_update,
+                sender=self.model, instances=objs, pks=pks, fields=list(kwargs), values=kwargs, using=self.db,
+            )
+
+        # Send pre_save signal for each object
+        if send_row_signals:
+            for obj in objs:
+                self.send_signal(pre_save, sender=obj.__class__, instance=obj, update_fields=kwargs.keys())
+
+        # Update the objects and get the number of updates, bypassing this mixin
+        updated_rows = super(SignalEnhancedQuerySetMixins, queryset).update(**kwargs)
+
+        # Update attributes of each object, only when a receiver will see them
+        if send_row_signals or post_bulk_update.has_listeners(self.model):
+            if self.should_refresh_after_update(kwargs):
+                self.refresh_updated_objects(objs, kwargs)
+            else:
+                for obj in objs:
+                    for attr, value in kwargs.items():
+                        # Set the new value for the attribute
+                        setattr(obj, attr, value)
+
+        post_signals = []
+
+        # Send post_save signal for each object
+        if send_row_signals:
+            for obj in objs:
+                post_signals.append(
+                    (post_save, dict(sender=obj.__class__, instance=obj, created=False, update_fields=kwargs.keys())),
+                )
+
+        # Send the post_bulk_update signal once for the batch
+        if post_bulk_update.has_listeners(self.model):
+            post_signals.append((
+                post_bulk_update,
+                dict(
+                    sender=self.model, instances=objs, pks=pks, fields=list(kwargs), values=kwargs, using=self.db,
+                    updated=updated_rows,
+                ),
+            ))
+
+        self.send_post_signals(post_signals)
+
+        return updated_rows
+
+    def should_refresh_after_update(self, kwargs: dict) -> bool:
+        """
+        Returns whether the updated objects are re-read from the database rather than assigned the update values.
+
+        Args:
+            - kwargs (dict): The fields to update and their new values.
+
+        Returns:
+            - bool: The value of `refresh_after_update`, or whether any value is an expression when it's None.
+        """
+        if self.refresh_after_update is None:
+            return any(hasattr(value, 'resolve_expression') for value in kwargs.values())
+        return self.refresh_after_update
+
+    def refresh_updated_objects(self, objs, kwargs: dict) -> None:
+        """
+        Reloads the updated columns of the objects with a single query.
+
+        Args:
+            - objs (list): The updated objects.
+            - kwargs (dict): The fields that were updated.
+        """
+        fields = [self.model._meta.get_field(name) for name in kwargs]
+        attnames = [field.attname for field in fields]
+        # The base manager reaches rows the update moved out of the queryset's filters
+        rows = self.model._base_manager.db_manager(self.db).filter(pk__in=[obj.pk for obj in objs])
+        values = {row[0]: row[1:] for row in rows.values_list('pk', *attnames)}
+        for obj in objs:
+            row = values.get(obj.pk)
+            if row is None:
+                continue
+            for field, value in zip(fields, row):
+                setattr(obj, field.attname, value)
+                # A changed foreign key invalidates the cached related object
+                if field.is_relation and field.is_cached(obj):
+                    field.delete_cached_value(obj)
+
+    @profiled_operation
     def delete(self, *args, **kwargs):
         """
-        Deletes all objects in the queryset and sends a `post_delete` signal for each object.
+        Deletes all objects in the queryset and sends the bulk delete signals, Django sends the `pre_delete` and
+        `post_delete` signals of each object.
 
         Args:
             - *args: Variable length argument list.
@@ -21,19 +363,24 @@ class SignalEnhancedQuerySetMixins:
             - tuple: A tuple containing the number of objects deleted and a dictionary with the number of deletions per
               object type.
         """
-        # Send pre_delete signal for each object
-        for obj in self:
-            pre_delete.send(sender=obj.__class__, instance=obj)
+        if not self.send_signals:
+            return super().delete()
 
-        # Delete the objects and get the number of deletions
-        deleted_count = super().delete(*args, **kwargs)
+        if not self.chunk_size:
+            # Without bulk receivers the objects don't need to be loaded
+            if not self.has_signal_receivers(pre_bulk_delete, post_bulk_delete):
+                return super().delete()
+            return self.delete_objects(list(self), self)
 
-        # Send post_delete signal for each object
-        for obj in self:
-            post_delete.send(sender=obj.__class__, instance=obj)
-
-        return deleted_count
+        # Sum the counts of the batches, like a single delete would report them
+        total, per_model = 0, {}
+        for count, counts in self.run_in_batches(self.delete_objects):
+            total += count
+            for label, label_count in counts.items():
+                per_model[label] = per_model.get(label, 0) + label_count
+        return total, per_model
 
+    @profiled_operation
     def update(self, **kwargs) -> int:
         """
         Updates all objects in the queryset with the given keyword arguments and sends `pre_save` and `post_save`
@@ -42,22 +389,157 @@ class SignalEnhancedQuerySetMixins:
         Args:
             - **kwargs: Keyword arguments representing the fields to update and their new values.
 
+        Returns:
+            - int: The number of rows updated, in change-aware mode the number of rows that actually changed.
+        """
+        if not self.send_signals:
+            return super().update(**kwargs)
+        if self.only_changed_rows:
+            # exclude() negates the equality of all the values, null-safely, leaving the rows where any differs
+            queryset = self.exclude(**kwargs)
+            queryset.only_changed_rows = False
+            return queryset.update(**kwargs)
+
+        if not self.chunk_size:
+            # Without receivers the objects don't need to be loaded
+            signals = (pre_bulk_update, post_bulk_update, *((pre_save, post_save) if self.send_row_signals else ()))
+            if not self.has_signal_receivers(*signals):
+                return super().update(**kwargs)
+            return self.update_objects(list(self), self, kwargs)
+        return sum(self.run_in_batches(lambda objs, queryset: self.update_objects(objs, queryset, kwargs)))
+
+    def split_batches(self, objs, batch_size=None) -> list:
+        """
+        Splits instances into the batches of a bulk write.
+
+        Args:
+            - objs (Iterable): The instances.
+            - batch_size (int, optional): The number of instances per batch. Defaults to `chunk_size`, or a single
+              batch when neither is set.
+
+        Returns:
+            - list: The batches, lists of instances.
+        """
+        objs = list(objs)
+        batch_size = batch_size or self.chunk_size or len(objs) or 1
+        return [objs[start:start + batch_size] for start in range(0, len(objs), batch_size)]
+
+    @profiled_operation
+    def bulk_create(self, objs, batch_size=None, **kwargs):
+        """
+        Creates instances with batched inserts, sending `pre_save` and `post_save` for each instance and the bulk
+        create signals once per batch.
+
+        The post-signals only cover the instances that got a primary key. With `ignore_conflicts`, or `update_conflicts`
+        on backends that don't return the inserted rows, the instances are left without one whether they were inserted
+        or not, so no `post_save` is sent for them and `post_bulk_create` is skipped for a batch left empty.
+
+        Args:
+            - objs (Iterable): The instances to create.
+            - batch_size (int, optional): The number of instances per insert and per bulk signal. Defaults to None.
+            - **kwargs: The other arguments of `QuerySet.bulk_create`, e.g. `ignore_conflicts`.
+
+        Returns:
+            - list: The created instances.
+        """
+        signals = (pre_bulk_create, post_bulk_create, *((pre_save, post_save) if self.send_row_signals else ()))
+        if not self.send_signals or not self.has_signal_receivers(*signals):
+            return super().bulk_create(objs, batch_size=batch_size, **kwargs)
+
+        send_row_signals = self.send_row_signals and self.has_signal_receivers(pre_save, post_save)
+        created = []
+        with transaction.atomic(using=self.db, savepoint=False):
+            for batch in self.split_batches(objs, batch_size):
+                # Send the pre_bulk_create signal once for the batch
+                if pre_bulk_create.has_listeners(self.model):
+                    self.send_signal(pre_bulk_create, sender=self.model, instances=batch, using=self.db)
+
+                # Send pre_save signal for each object
+                if send_row_signals:
+                    for obj in batch:
+                        self.send_signal(
+                            pre_save, sender=obj.__class__, instance=obj, raw=False, using=self.db, update_fields=None,
+                        )
+
+                # Create the batch with a single insert, bypassing this mixin
+                batch = super().bulk_create(batch, **kwargs)
+                created.extend(batch)
+
+                # Rows skipped by a conflict, or whose key the backend doesn't return, can't be told apart
+                batch = [obj for obj in batch if obj.pk is not None]
+                if not batch:
+                    continue
+
+                post_signals = []
+                if send_row_signals:
+                    for obj in batch:
+                        post_signals.append((post_save, dict(
+                            sender=obj.__class__, instance=obj, created=True, raw=False, using=self.db,
+                            update_fields=None,
+                        )))
+                if post_bulk_create.has_listeners(self.model):
+                    post_signals.append((post_bulk_create, dict(sender=self.model, instances=batch, using=self.db)))
+                self.send_post_signals(post_signals)
+        return created
+
+    @profiled_operation
+    def bulk_update(self, objs, fields, batch_size=None) -> int:
+        """
+        Updates fields of instances with batched statements, sending `pre_save` and `post_save` for each instance and
+        the bulk update signals once per batch.
+
+        Args:
+            - objs (Iterable): The instances to update.
+            - fields (Iterable): The names of the fields to update.
+            - batch_size (int, optional): The number of instances per statement and per bulk signal. Defaults to None.
+
         Returns:
             - int: The number of rows updated.
         """
-        # Send pre_save signal for each object
-        for obj in self:
-            pre_save.send(sender=obj.__class__, instance=obj, update_fields=kwargs.keys())
+        fields = list(fields)
+        signals = (pre_bulk_update, post_bulk_update, *((pre_save, post_save) if self.send_row_signals else ()))
+        if not self.send_signals or not self.has_signal_receivers(*signals):
+            # Django's bulk_update runs update() on a clone, which must not send the row signals again
+            return super(SignalEnhancedQuerySetMixins, self.without_signals()).bulk_update(
+                objs, fields, batch_size=batch_size,
+            )
+
+        send_row_signals = self.send_row_signals and self.has_signal_receivers(pre_save, post_save)
+        updated_rows = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for batch in self.split_batches(objs, batch_size):
+                pks = [obj.pk for obj in batch]
+
+                # Send the pre_bulk_update signal once for the batch
+                if pre_bulk_update.has_listeners(self.model):
+                    self.send_signal(
+                        pre_bulk_update,
+                        sender=self.model, instances=batch, pks=pks, fields=fields, values=None, using=self.db,
+                    )
 
-        # Update the objects and get the number of updates
-        updated_rows = super().update(**kwargs)
+                # Send pre_save signal for each object
+                if send_row_signals:
+                    for obj in batch:
+                        self.send_signal(
+                            pre_save,
+                            sender=obj.__class__, instance=obj, raw=False, using=self.db, update_fields=fields,
+                        )
 
-        # Update attributes & send post_save signal for each object
-        for obj in self:
-            for attr, value in kwargs.items():
-                # Set the new value for the attribute
-                setattr(obj, attr, value)
-            # Send the post_save signal
-            post_save.send(sender=obj.__class__, instance=obj, created=False, update_fields=kwargs.keys())
+                # Update the batch with a single statement, bypassing this mixin
+                batch_rows = super(SignalEnhancedQuerySetMixins, self.without_signals()).bulk_update(batch, fields)
+                updated_rows += batch_rows
 
+                post_signals = []
+                if send_row_signals:
+                    for obj in batch:
+                        post_signals.append((post_save, dict(
+                            sender=obj.__class__, instance=obj, created=False, raw=False, using=self.db,
+                            update_fields=fields,
+                        )))
+                if post_bulk_update.has_listeners(self.model):
+                    post_signals.append((post_bulk_update, dict(
+                        sender=self.model, instances=batch, pks=pks, fields=fields, values=None, using=self.db,
+                        updated=batch_rows,
+                    )))
+                self.send_post_signals(post_signals)
         return updated_rows
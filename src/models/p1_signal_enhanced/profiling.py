@@ -0,0 +1,178 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Tuple
+
+from django.db.models import signals as model_signals
+from django.dispatch import Signal
+
+from . import signals as bulk_signals
+from .dispatch import get_receivers
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_signal_name(signal: Signal) -> str:
+    """
+    Returns the name of a model or bulk signal, as used in the reports.
+
+    Args:
+        - signal (Signal): The signal.
+
+    Returns:
+        - str: The name of the module attribute holding the signal, or its repr for unknown signals.
+    """
+    for module in (model_signals, bulk_signals):
+        for name, value in vars(module).items():
+            if value is signal:
+                return name
+    return repr(signal)
+
+
+class SignalProfiler:
+    """
+    Records the number of calls, total and maximum duration of each signal receiver, per signal and sender.
+
+    The profiler is thread-safe, so receivers deferred to the signal thread pool are recorded too.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty profiler.
+        """
+        self.lock = threading.Lock()
+        self.depth = 0
+        #: Maps (signal, sender, receiver) names to the number of calls, total and maximum duration in seconds.
+        self.stats = {}
+
+    def record(self, signal: Signal, sender, receiver: Callable, duration: float) -> None:
+        """
+        Records a receiver call.
+
+        Args:
+            - signal (Signal): The signal sent.
+            - sender: The sender, usually a model class.
+            - receiver (Callable): The receiver called.
+            - duration (float): The duration of the call in seconds.
+        """
+        key = (
+            get_signal_name(signal),
+            getattr(getattr(sender, '_meta', None), 'label', repr(sender)),
+            getattr(receiver, '__module__', '') + '.' + getattr(receiver, '__qualname__', repr(receiver)),
+        )
+        with self.lock:
+            calls, total, maximum = self.stats.get(key, (0, 0.0, 0.0))
+            self.stats[key] = (calls + 1, total + duration, max(maximum, duration))
+
+    def send(self, signal: Signal, **kwargs) -> List[Tuple[Callable, object]]:
+        """
+        Sends a signal like `Signal.send`, timing each receiver.
+
+        Args:
+            - signal (Signal): The signal to send.
+            - **kwargs: The signal arguments, the sender included.
+
+        Returns:
+            - list: Pairs of receiver and response.
+        """
+        responses = []
+        for receiver in get_receivers(signal, kwargs['sender']):
+            start = time.perf_counter()
+            try:
+                responses.append((receiver, receiver(signal=signal, **kwargs)))
+            finally:
+                self.record(signal, kwargs['sender'], receiver, time.perf_counter() - start)
+        return responses
+
+    def report(self) -> List[Dict]:
+        """
+        Returns the recorded statistics, the receivers taking the most time first.
+
+        Returns:
+            - list: One dict per (signal, sender, receiver) with the `calls` and the `total_ms`, `max_ms` and
+              `mean_ms` durations.
+        """
+        with self.lock:
+            stats = list(self.stats.items())
+        return [
+            {
+                'signal': signal,
+                'sender': sender,
+                'receiver': receiver,
+                'calls': calls,
+                'total_ms': round(total * 1000, 3),
+                'max_ms': round(maximum * 1000, 3),
+                'mean_ms': round(total * 1000 / calls, 3),
+            }
+            for (signal, sender, receiver), (calls, total, maximum) in sorted(stats, key=lambda item: -item[1][1])
+        ]
+
+    def format_report(self) -> str:
+        """
+        Formats the recorded statistics as a text table.
+
+        Returns:
+            - str: One line per receiver, the receivers taking the most time first.
+        """
+        lines = [f'{"total ms":>10} {"max ms":>10} {"calls":>8}  signal / sender / receiver']
+        for row in self.report():
+            lines.append(
+                f'{row["total_ms"]:>10.1f} {row["max_ms"]:>10.1f} {row["calls"]:>8}  '
+                f'{row["signal"]} / {row["sender"]} / {row["receiver"]}'
+            )
+        return '\n'.join(lines)
+
+    def log(self, operation: str) -> None:
+        """
+        Logs the recorded statistics as one JSON line.
+
+        Args:
+            - operation (str): The operation the statistics belong to, e.g. 'shop.Product update'.
+        """
+        logger.info(json.dumps({'operation': operation, 'receivers': self.report()}))
+
+    @contextmanager
+    def operation(self, name: str):
+        """
+        Logs the statistics when the outermost profiled operation ends, operations may call each other.
+
+        Args:
+            - name (str): The name of the operation.
+        """
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if not self.depth:
+                self.log(name)
+
+    def reset(self) -> None:
+        """
+        Clears the recorded statistics.
+        """
+        with self.lock:
+            self.stats.clear()
+
+
+def profiled_operation(method: Callable) -> Callable:
+    """
+    Decorator logging the receiver statistics of a queryset operation when the queryset has a `signal_profiler`.
+
+    Args:
+        - method (Callable): The queryset method, e.g. `update`.
+
+    Returns:
+        - Callable: The wrapped method, which only checks an attribute when profiling is off.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.signal_profiler is None:
+            return method(self, *args, **kwargs)
+        with self.signal_profiler.operation(f'{self.model._meta.label} {method.__name__}'):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,17 @@
+from django.dispatch import Signal
+
+
+#: Sent once per batch before `bulk_create`, with `instances` and `using`.
+pre_bulk_create = Signal()
+#: Sent once per batch after `bulk_create`, with the created `instances`, their primary keys set when the backend
+#: returns them, and `using`.
+post_bulk_create = Signal()
+#: Sent once per batch before a bulk update, with `instances`, `pks`, the updated `fields`, `values` (the update kwargs,
+#: None for `bulk_update` where each instance holds its values) and `using`.
+pre_bulk_update = Signal()
+#: Sent once per batch after a bulk update, with the same arguments as `pre_bulk_update` and the `updated` row count.
+post_bulk_update = Signal()
+#: Sent once per batch before a bulk delete, with `instances`, `pks` and `using`.
+pre_bulk_delete = Signal()
+#: Sent once per batch after a bulk delete, with the same arguments as `pre_bulk_delete` and the `deleted` counts.
+post_bulk_delete = Signal()
@@ -0,0 +1,118 @@
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat
+from django.db.models.signals import post_save
+from django.test import TestCase
+
+from .mixins import SignalEnhancedQuerySetMixins
+from .signals import post_bulk_create, post_bulk_update
+
+
+class SignalEnhancedPermissionQuerySet(SignalEnhancedQuerySetMixins, models.QuerySet):
+    pass
+
+
+class SignalEnhancedQuerySetTests(TestCase):
+    """
+    Permissions stand for the model, no other module connects receivers to them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.content_type = ContentType.objects.get_for_model(User)
+        Permission.objects.bulk_create([
+            Permission(name=f'Perm {i}', codename=f'test_perm_{i}', content_type=cls.content_type) for i in range(3)
+        ])
+
+    def setUp(self):
+        self.queryset = SignalEnhancedPermissionQuerySet(Permission).filter(codename__startswith='test_')
+
+    def connect(self, signal) -> list:
+        """
+        Connects a receiver recording the arguments of each signal sent for permissions.
+
+        Args:
+            - signal (Signal): The signal to listen to.
+
+        Returns:
+            - list: The arguments of the received signals, filled as they are sent.
+        """
+        received = []
+
+        def receiver(sender, **kwargs):
+            received.append(kwargs)
+
+        signal.connect(receiver, sender=Permission, weak=False)
+        self.addCleanup(signal.disconnect, receiver, sender=Permission)
+        return received
+
+    def test_nothing_is_loaded_without_receivers(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.queryset.update(name='Renamed'), 3)
+
+    def test_expressions_are_refreshed_with_a_single_query(self):
+        received = self.connect(post_save)
+        # Load, update, then one query re-reading the updated column of every row
+        with self.assertNumQueries(3):
+            self.queryset.update(name=Concat('name', Value('!')))
+        self.assertEqual(
+            sorted(kwargs['instance'].name for kwargs in received), ['Perm 0!', 'Perm 1!', 'Perm 2!'],
+        )
+
+    def test_deferred_signals_are_sent_after_commit(self):
+        received = self.connect(post_save)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.queryset.deferred().update(name='Renamed')
+            self.assertEqual(received, [])
+        self.assertEqual(len(received), 3)
+
+    def test_deferred_signals_are_dropped_on_rollback(self):
+        received = self.connect(post_save)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.queryset.deferred().update(name='Renamed')
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(received, [])
+        self.assertFalse(self.queryset.filter(name='Renamed').exists())
+
+    def test_only_changed_skips_unchanged_rows(self):
+        received = self.connect(post_save)
+        self.assertEqual(self.queryset.only_changed().update(name='Perm 1'), 2)
+        self.assertEqual(sorted(kwargs['instance'].codename for kwargs in received), ['test_perm_0', 'test_perm_2'])
+
+    def test_bulk_create_sends_the_bulk_signal_once(self):
+        received = self.connect(post_bulk_create)
+        saved = self.connect(post_save)
+        self.queryset.bulk_create([
+            Permission(name=f'New {i}', codename=f'test_new_{i}', content_type=self.content_type) for i in range(3)
+        ])
+        self.assertEqual(len(received), 1)
+        self.assertEqual(len(received[0]['instances']), 3)
+        self.assertEqual(len(saved), 3)
+        self.assertTrue(all(kwargs['created'] for kwargs in saved))
+
+    def test_bulk_create_skips_the_instances_without_primary_key(self):
+        received = self.connect(post_bulk_create)
+        saved = self.connect(post_save)
+        self.queryset.bulk_create(
+            [Permission(name='Duplicate', codename='test_perm_0', content_type=self.content_type)],
+            ignore_conflicts=True,
+        )
+        self.assertEqual(received, [])
+        self.assertEqual(saved, [])
+
+    def test_bulk_update_sends_the_bulk_signal_once(self):
+        received = self.connect(post_bulk_update)
+        permissions = list(self.queryset)
+        for permission in permissions:
+            permission.name = permission.name.upper()
+        self.assertEqual(self.queryset.bulk_update(permissions, ['name']), 3)
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]['pks'], [permission.pk for permission in permissions])
+        self.assertEqual(received[0]['updated'], 3)
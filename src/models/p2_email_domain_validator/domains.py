@@ -0,0 +1,95 @@
+from typing import Iterable
+
+from django.utils.encoding import punycode
+
+
+#: The label standing for any subdomain in an allowed domain, e.g. `*.corp.example`.
+WILDCARD = '*'
+
+
+def normalize_domain(domain: str) -> str:
+    """
+    Normalizes a domain for comparison, lowercased and IDNA encoded.
+
+    Args:
+        - domain (str): The domain, e.g. `Exämple.COM`.
+
+    Returns:
+        - str: The ASCII form of the domain, e.g. `xn--exmple-cua.com`.
+
+    Raises:
+        - UnicodeError: If the domain can't be IDNA encoded.
+    """
+    domain = domain.lower()
+    if not domain.isascii():
+        domain = punycode(domain)
+    return domain
+
+
+class DomainAllowlist:
+    """
+    The compiled set of domains an email may belong to, exact domains and `*.`-prefixed wildcards of their subdomains.
+
+    The domains are normalized once, the exact ones go into a set and the wildcards into a trie of their reversed
+    labels, so a check costs a set lookup and a walk over the labels of the domain, whatever the number of domains.
+    """
+
+    def __init__(self, domains: Iterable[str]) -> None:
+        """
+        Compiles the allowlist.
+
+        Args:
+            - domains (Iterable): The allowed domains, e.g. `['example.com', '*.corp.example']`.
+        """
+        exact, wildcards = set(), set()
+        for domain in domains:
+            domain = domain.strip().rstrip('.')
+            if domain.startswith(WILDCARD + '.'):
+                wildcards.add(normalize_domain(domain[2:]))
+            else:
+                exact.add(normalize_domain(domain))
+        self.exact = frozenset(exact)
+        self.wildcards = frozenset(wildcards)
+        self.root = {}
+        for domain in self.wildcards:
+            node = self.root
+            for label in reversed(domain.split('.')):
+                node = node.setdefault(label, {})
+            # The wildcard key can't collide with a valid label and marks the suffixes whose subdomains are allowed
+            node[WILDCARD] = True
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DomainAllowlist) and self.exact == other.exact and self.wildcards == other.wildcards
+
+    def matches_exact(self, domain: str) -> bool:
+        """
+        Checks whether a normalized domain is one of the exact allowed domains.
+
+        Args:
+            - domain (str): The normalized domain.
+
+        Returns:
+            - bool: `True` if the domain is allowed as is.
+        """
+        return domain in self.exact
+
+    def matches_wildcard(self, domain: str) -> bool:
+        """
+        Checks whether a normalized domain is a subdomain of an allowed wildcard, `*.corp.example` matches
+        `eu.corp.example` and `mail.eu.corp.example` but not `corp.example` itself.
+
+        Args:
+            - domain (str): The normalized domain.
+
+        Returns:
+            - bool: `True` if a wildcard covers the domain.
+        """
+        node = self.root
+        # The leftmost label is always left for the wildcard to match
+        for label in reversed(domain.split('.')[1:]):
+            node = node.get(label)
+            if node is None:
+                return False
+            if WILDCARD in node:
+                return True
+        return False
@@ -0,0 +1,340 @@
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+try:
+    import dns.resolver
+except ImportError:
+    dns = None
+
+
+logger = logging.getLogger(__name__)
+
+#: The shared resolver used by the validators, created on first use.
+_domain_resolver = None
+_domain_resolver_lock = threading.Lock()
+
+
+def resolve_mx_or_a(domain: str, timeout: float) -> bool:
+    """
+    Checks whether a domain has an MX, A or AAAA record, with dnspython when installed, otherwise through the system
+    resolver, which only sees address records.
+
+    Args:
+        - domain (str): The IDNA encoded domain.
+        - timeout (float): The time allowed for the lookup in seconds, the system resolver ignores it.
+
+    Returns:
+        - bool: `True` if the domain can receive email, `False` if it doesn't exist or has no such record.
+
+    Raises:
+        - Exception: If the lookup fails for another reason, e.g. a timeout, so the result isn't cached as negative.
+    """
+    if dns is not None:
+        for rdtype in ('MX', 'A', 'AAAA'):
+            try:
+                dns.resolver.resolve(domain, rdtype, lifetime=timeout)
+                return True
+            except dns.resolver.NXDOMAIN:
+                return False
+            except dns.resolver.NoAnswer:
+                continue
+        return False
+
+    try:
+        socket.getaddrinfo(domain, None)
+        return True
+    except socket.gaierror as error:
+        if error.errno in (socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', socket.EAI_NONAME)):
+            return False
+        raise
+
+
+class StubResolver:
+    """
+    An in-process resolver hook answering from a mapping instead of DNS, for tests and offline environments.
+
+    Domains missing from `answers` get the `default` answer. An answer that is an exception (instance or class) is
+    raised, like a failed lookup, and `delays` makes the lookups of some domains slow, to exercise the timeout budget.
+    Every looked up domain is appended to `calls`, so tests can check what the cache saved.
+    """
+
+    def __init__(
+        self,
+        answers: Optional[Dict[str, object]] = None,
+        default: bool = True,
+        delays: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Initializes the stub.
+
+        Args:
+            - answers (dict, optional): Maps IDNA encoded domains to their deliverability, or to an exception to raise.
+              Defaults to None.
+            - default (bool, optional): The deliverability of the other domains. Defaults to True.
+            - delays (dict, optional): Maps domains to the time their lookup takes, in seconds. Defaults to None.
+        """
+        self.answers = dict(answers or {})
+        self.default = default
+        self.delays = dict(delays or {})
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, domain: str, timeout: float) -> bool:
+        """
+        Answers a lookup like `resolve_mx_or_a`.
+
+        Args:
+            - domain (str): The IDNA encoded domain.
+            - timeout (float): The time allowed for the lookup in seconds, ignored.
+
+        Returns:
+            - bool: The configured deliverability of the domain.
+
+        Raises:
+            - Exception: The configured exception of the domain.
+        """
+        with self.lock:
+            self.calls.append(domain)
+        if domain in self.delays:
+            time.sleep(self.delays[domain])
+        answer = self.answers.get(domain, self.default)
+        if isinstance(answer, BaseException) or (isinstance(answer, type) and issubclass(answer, BaseException)):
+            raise answer
+        return answer
+
+
+class CachedDomainResolver:
+    """
+    Caches the deliverability of email domains in process, around a resolver hook doing the actual DNS lookups.
+
+    The cache is an LRU of `maxsize` domains, deliverable domains are kept for `ttl` seconds and the others for
+    `negative_ttl` seconds. Lookups run on a thread pool within a `timeout` budget, domains that fail or can't be
+    resolved in time are considered deliverable for `error_ttl` seconds, so a slow DNS server never rejects valid
+    addresses nor is queried again for every address. The thread pool is created on first use and shared by every
+    check of the resolver, call `shutdown()` to stop its threads.
+    """
+
+    def __init__(
+        self,
+        resolver: Callable[[str, float], bool] = resolve_mx_or_a,
+        maxsize: int = 10000,
+        ttl: float = 3600,
+        negative_ttl: float = 300,
+        error_ttl: float = 60,
+        timeout: float = 2.0,
+        max_workers: int = 8,
+    ) -> None:
+        """
+        Initializes the resolver with an empty cache.
+
+        Args:
+            - resolver (Callable, optional): The hook called with the domain and the timeout, returning whether the
+              domain can receive email. Defaults to `resolve_mx_or_a`.
+            - maxsize (int, optional): The maximum number of cached domains. Defaults to 10000.
+            - ttl (float, optional): How long deliverable domains are cached, in seconds. Defaults to 3600.
+            - negative_ttl (float, optional): How long undeliverable domains are cached, in seconds. Defaults to 300.
+            - error_ttl (float, optional): How long domains whose lookup failed or timed out are cached as deliverable,
+              in seconds. Defaults to 60.
+            - timeout (float, optional): The time budget of a check, single or batch, in seconds. Defaults to 2.0.
+            - max_workers (int, optional): The maximum number of concurrent lookups. Defaults to 8.
+        """
+        self.resolver = resolver
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        #: Maps domains to their deliverability and expiry time, the least recently used first.
+        self.cache = OrderedDict()
+        #: The thread pool running the lookups, created on first use.
+        self.executor = None
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the thread pool running the lookups.
+
+        Returns:
+            - ThreadPoolExecutor: A pool of `max_workers` threads, created on first use.
+        """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='email-domain-lookup',
+                )
+            return self.executor
+
+    def shutdown(self) -> None:
+        """
+        Stops the thread pool without waiting for the running lookups, which still cache their result. The next
+        check creates a new pool.
+        """
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_cached(self, domain: str) -> Optional[bool]:
+        """
+        Returns the cached deliverability of a domain.
+
+        Args:
+            - domain (str): The IDNA encoded domain.
+
+        Returns:
+            - bool or None: The deliverability, or None if the domain isn't cached or has expired.
+        """
+        with self.lock:
+            entry = self.cache.get(domain)
+            if entry is None:
+                return None
+            deliverable, expires = entry
+            if expires <= time.monotonic():
+                del self.cache[domain]
+                return None
+            self.cache.move_to_end(domain)
+            return deliverable
+
+    def set_cached(self, domain: str, deliverable: bool, ttl: Optional[float] = None) -> None:
+        """
+        Caches the deliverability of a domain, evicting the least recently used domains beyond `maxsize`.
+
+        Args:
+            - domain (str): The IDNA encoded domain.
+            - deliverable (bool): Whether the domain can receive email.
+            - ttl (float, optional): How long the result is cached, in seconds. Defaults to `ttl` or `negative_ttl`.
+        """
+        if ttl is None:
+            ttl = self.ttl if deliverable else self.negative_ttl
+        expires = time.monotonic() + ttl
+        with self.lock:
+            self.cache[domain] = (deliverable, expires)
+            self.cache.move_to_end(domain)
+            while len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+
+    def lookup(self, domain: str) -> bool:
+        """
+        Looks a domain up through the resolver hook and caches the result.
+
+        Args:
+            - domain (str): The IDNA encoded domain.
+
+        Returns:
+            - bool: Whether the domain can receive email, `True` when the lookup fails.
+        """
+        start = time.perf_counter()
+        try:
+            deliverable = bool(self.resolver(domain, self.timeout))
+        except Exception as error:
+            logger.warning('Lookup of email domain %s failed: %r', domain, error)
+            self.set_cached(domain, True, self.error_ttl)
+            return True
+        logger.debug('Lookup of email domain %s took %.1f ms', domain, (time.perf_counter() - start) * 1000)
+        self.set_cached(domain, deliverable)
+        return deliverable
+
+    def resolve_many(self, domains: Iterable[str]) -> Dict[str, bool]:
+        """
+        Returns the deliverability of domains, looking the uncached ones up concurrently within the timeout budget.
+
+        Args:
+            - domains (Iterable): The IDNA encoded domains.
+
+        Returns:
+            - dict: Maps each domain to whether it can receive email, `True` for those not resolved in time.
+        """
+        results, missing = {}, []
+        for domain in set(domains):
+            deliverable = self.get_cached(domain)
+            if deliverable is None:
+                missing.append(domain)
+            else:
+                results[domain] = deliverable
+        if not missing:
+            return results
+
+        executor = self.get_executor()
+        futures = {executor.submit(self.lookup, domain): domain for domain in missing}
+        done, not_done = wait(futures, timeout=self.timeout)
+        for future in done:
+            results[futures[future]] = future.result()
+        for future in not_done:
+            # Lookups still queued are dropped, running ones still cache their actual result but aren't waited for
+            future.cancel()
+            logger.warning('Lookup of email domain %s timed out', futures[future])
+            self.set_cached(futures[future], True, self.error_ttl)
+            results[futures[future]] = True
+        return results
+
+    def is_deliverable(self, domain: str) -> bool:
+        """
+        Returns whether a domain can receive email, from the cache or a lookup within the timeout budget.
+
+        Args:
+            - domain (str): The IDNA encoded domain.
+
+        Returns:
+            - bool: Whether the domain can receive email, `True` if it couldn't be resolved in time.
+        """
+        deliverable = self.get_cached(domain)
+        if deliverable is None:
+            deliverable = self.resolve_many([domain])[domain]
+        return deliverable
+
+    def clear(self) -> None:
+        """
+        Empties the cache.
+        """
+        with self.lock:
+            self.cache.clear()
+
+
+def get_domain_resolver() -> CachedDomainResolver:
+    """
+    Returns the shared resolver of the validators checking deliverability.
+
+    The resolver hook is the dotted path in the `EMAIL_DOMAIN_RESOLVER` setting, `resolve_mx_or_a` by default, and
+    `EMAIL_DOMAIN_RESOLVER_OPTIONS` holds the keyword arguments of `CachedDomainResolver`, e.g. `{'timeout': 1.0}`.
+
+    Returns:
+        - CachedDomainResolver: The resolver, created on first use.
+    """
+    global _domain_resolver
+    with _domain_resolver_lock:
+        if _domain_resolver is None:
+            resolver = getattr(settings, 'EMAIL_DOMAIN_RESOLVER', None)
+            _domain_resolver = CachedDomainResolver(
+                resolver=import_string(resolver) if resolver else resolve_mx_or_a,
+                **getattr(settings, 'EMAIL_DOMAIN_RESOLVER_OPTIONS', {}),
+            )
+        return _domain_resolver
+
+
+@receiver(setting_changed)
+def reset_domain_resolver(setting: str, **kwargs) -> None:
+    """
+    Drops the shared resolver, its cache and its thread pool when its settings change, e.g. when tests plug a stub
+    resolver.
+
+    Args:
+        - setting (str): The name of the changed setting.
+        - **kwargs: Additional keyword arguments.
+    """
+    global _domain_resolver
+    if setting.startswith('EMAIL_DOMAIN_RESOLVER'):
+        with _domain_resolver_lock:
+            resolver, _domain_resolver = _domain_resolver, None
+        if resolver is not None:
+            resolver.shutdown()
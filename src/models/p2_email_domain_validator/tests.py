@@ -0,0 +1,153 @@
+import time
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, override_settings
+
+from .resolvers import CachedDomainResolver, StubResolver, get_domain_resolver
+from .validators import DomainEmailValidator
+
+
+#: The resolver hook plugged through the `EMAIL_DOMAIN_RESOLVER` setting by the validator tests.
+stub_resolver = StubResolver({'bad.example': False})
+
+
+class FakeClock:
+    """
+    A monotonic clock advanced by hand, standing for `time.monotonic` in the cache expiry checks.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CachedDomainResolverTests(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('models.p2_email_domain_validator.resolvers.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_positive_answers_are_cached_for_ttl(self):
+        stub = StubResolver()
+        resolver = CachedDomainResolver(stub, ttl=60, negative_ttl=10)
+        self.assertIs(resolver.lookup('good.example'), True)
+        self.clock.now += 59
+        self.assertIs(resolver.get_cached('good.example'), True)
+        self.clock.now += 1
+        self.assertIsNone(resolver.get_cached('good.example'))
+        self.assertIs(resolver.lookup('good.example'), True)
+        self.assertEqual(stub.calls, ['good.example', 'good.example'])
+
+    def test_negative_answers_are_cached_for_negative_ttl(self):
+        stub = StubResolver({'bad.example': False})
+        resolver = CachedDomainResolver(stub, ttl=60, negative_ttl=10)
+        self.assertIs(resolver.lookup('bad.example'), False)
+        self.clock.now += 9
+        self.assertIs(resolver.get_cached('bad.example'), False)
+        self.clock.now += 1
+        self.assertIsNone(resolver.get_cached('bad.example'))
+
+    def test_failed_lookups_are_deliverable_for_error_ttl(self):
+        stub = StubResolver({'broken.example': OSError('SERVFAIL')})
+        resolver = CachedDomainResolver(stub, ttl=60, negative_ttl=10, error_ttl=5)
+        with self.assertLogs('models.p2_email_domain_validator.resolvers', 'WARNING'):
+            self.assertIs(resolver.lookup('broken.example'), True)
+        self.clock.now += 4
+        self.assertIs(resolver.get_cached('broken.example'), True)
+        self.clock.now += 1
+        self.assertIsNone(resolver.get_cached('broken.example'))
+
+    def test_least_recently_used_domains_are_evicted(self):
+        resolver = CachedDomainResolver(StubResolver(), maxsize=2)
+        for domain in ('a.example', 'b.example'):
+            resolver.lookup(domain)
+        resolver.get_cached('a.example')
+        resolver.lookup('c.example')
+        self.assertEqual(list(resolver.cache), ['a.example', 'c.example'])
+
+
+class ResolverTimeoutTests(SimpleTestCase):
+
+    def test_slow_lookups_fail_open_within_the_budget(self):
+        stub = StubResolver({'slow.example': False}, delays={'slow.example': 0.5})
+        resolver = CachedDomainResolver(stub, timeout=0.05, error_ttl=60)
+        self.addCleanup(resolver.shutdown)
+        start = time.monotonic()
+        with self.assertLogs('models.p2_email_domain_validator.resolvers', 'WARNING') as logs:
+            results = resolver.resolve_many(['slow.example', 'good.example'])
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(results, {'slow.example': True, 'good.example': True})
+        self.assertIn('timed out', logs.output[0])
+        self.assertIs(resolver.get_cached('slow.example'), True)
+        # The late lookup still caches its actual answer
+        time.sleep(0.6)
+        self.assertIs(resolver.get_cached('slow.example'), False)
+
+    def test_checks_share_one_thread_pool(self):
+        resolver = CachedDomainResolver(StubResolver())
+        self.addCleanup(resolver.shutdown)
+        resolver.resolve_many(['a.example', 'b.example'])
+        executor = resolver.executor
+        self.assertIs(resolver.is_deliverable('c.example'), True)
+        self.assertIs(resolver.executor, executor)
+
+    def test_settings_change_shuts_the_thread_pool_down(self):
+        with override_settings(EMAIL_DOMAIN_RESOLVER='models.p2_email_domain_validator.tests.stub_resolver'):
+            resolver = get_domain_resolver()
+            resolver.is_deliverable('other.example')
+            executor = resolver.executor
+        self.assertIsNone(resolver.executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+
+
+@override_settings(EMAIL_DOMAIN_RESOLVER='models.p2_email_domain_validator.tests.stub_resolver')
+class DeliverabilityValidatorTests(SimpleTestCase):
+
+    def setUp(self):
+        # The shared resolver lives as long as the settings override, i.e. the whole class
+        get_domain_resolver().clear()
+        stub_resolver.calls.clear()
+        self.validator = DomainEmailValidator(['*.example', 'example.com'], check_deliverability=True)
+
+    def test_call_rejects_undeliverable_domains(self):
+        self.validator('user@good.example')
+        with self.assertRaises(ValidationError) as context:
+            self.validator('user@bad.example')
+        self.assertEqual(context.exception.code, 'undeliverable')
+
+    def test_validate_many_looks_each_domain_up_once(self):
+        values = ['a@good.example', 'b@bad.example', 'c@good.example', 'not an email', 'd@other.com', 'e@example.com']
+        self.assertEqual(
+            list(self.validator.validate_many(values, chunk_size=2)),
+            [
+                ('a@good.example', True), ('b@bad.example', False), ('c@good.example', True),
+                ('not an email', False), ('d@other.com', False), ('e@example.com', True),
+            ],
+        )
+        self.assertEqual(sorted(stub_resolver.calls), ['bad.example', 'example.com', 'good.example'])
+
+    def test_validate_many_reuses_the_deliverability_cache(self):
+        list(self.validator.validate_many(['a@good.example', 'b@bad.example']))
+        self.validator('c@good.example')
+        self.assertEqual(
+            list(self.validator.validate_many(['d@good.example', 'e@bad.example'])),
+            [('d@good.example', True), ('e@bad.example', False)],
+        )
+        self.assertEqual(sorted(stub_resolver.calls), ['bad.example', 'good.example'])
+
+    def test_validate_many_matches_call(self):
+        values = ['a@good.example', 'b@bad.example', 'c@sub.good.example', 'd@other.com']
+        for value, valid in self.validator.validate_many(values):
+            with self.subTest(value):
+                try:
+                    self.validator(value)
+                except ValidationError:
+                    self.assertFalse(valid)
+                else:
+                    self.assertTrue(valid)
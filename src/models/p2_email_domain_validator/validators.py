@@ -1,19 +1,28 @@
-from django.core.validators import EmailValidator
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from django.core.validators import EmailValidator, validate_ipv46_address
 from django.core.exceptions import ValidationError
 from django.utils.deconstruct import deconstructible
 from django.utils.translation import gettext_lazy as _
 
+from .domains import DomainAllowlist, normalize_domain
+from .resolvers import CachedDomainResolver, get_domain_resolver
+
 
 @deconstructible
 class DomainEmailValidator(EmailValidator):
     """
-    A validator that checks if the email's domain part matches a specific allowed domain.
+    A validator that checks if the email's domain part matches one of the allowed domains.
 
     The class adds an extra layer of validation on top of the basic email validation by ensuring the domain part of the
-    email matches a specified domain. It supports both literal IP addresses and domain names.
+    email matches a specified domain, or a subdomain of a `*.`-prefixed wildcard domain. It supports both literal IP
+    addresses and domain names. With `check_deliverability`, it also rejects domains without an MX or A record.
     """
 
     _message = _('Invalid email domain it should {allowed_domain}')
+    undeliverable_message = _('The email domain does not accept email.')
+    undeliverable_code = 'undeliverable'
 
     @property
     def message(self) -> str:
@@ -26,7 +35,10 @@ class DomainEmailValidator(EmailValidator):
         Returns:
             - str: The formatted validation message.
         """
-        return self._message.format(allowed_domain=self.allowed_domain)
+        allowed_domain = self.allowed_domain
+        if not isinstance(allowed_domain, str):
+            allowed_domain = ', '.join(allowed_domain)
+        return self._message.format(allowed_domain=allowed_domain)
 
     @message.setter
     def message(self, value: str) -> None:
@@ -40,46 +52,169 @@ class DomainEmailValidator(EmailValidator):
         """
         self._message = value
 
-    def __init__(self, allowed_domain: str, *args, **kwargs) -> None:
+    def __init__(
+        self, allowed_domain: Union[str, Iterable[str]], *args, check_deliverability: bool = False, **kwargs
+    ) -> None:
         """
-        Initializes the DomainEmailValidator with a specific allowed domain.
+        Initializes the DomainEmailValidator with the allowed domains.
 
-        This constructor sets the domain that email addresses must match and passes any additional arguments to the
-        parent `EmailValidator` class.
+        This constructor compiles the domains that email addresses must match and passes any additional arguments to
+        the parent `EmailValidator` class.
 
         Args:
-            - allowed_domain (str): The domain that is allowed for the email addresses.
+            - allowed_domain (str or Iterable): The domain, or the collection of domains, that is allowed for the email
+              addresses, e.g. `['example.com', '*.corp.example']`.
             - *args: Variable length argument list.
+            - check_deliverability (bool, optional): Whether domains without an MX or A record are rejected, through
+              the cached resolver of `get_domain_resolver`. Defaults to False.
             - **kwargs: Arbitrary keyword arguments passed to the parent `EmailValidator`.
          """
+        if not isinstance(allowed_domain, str):
+            allowed_domain = sorted(set(allowed_domain))
         self.allowed_domain = allowed_domain
+        self.allowlist = DomainAllowlist([allowed_domain] if isinstance(allowed_domain, str) else allowed_domain)
+        self.check_deliverability = check_deliverability
+        # Deconstruct the sorted domains rather than the given collection, so sets don't produce new migrations, and
+        # leave the default deliverability out so existing migrations stay unchanged
+        constructor_kwargs = {**kwargs, 'check_deliverability': True} if check_deliverability else kwargs
+        self._constructor_args = ((allowed_domain, *args), constructor_kwargs)
         super().__init__(*args, **kwargs)
 
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, DomainEmailValidator)
+            and super().__eq__(other)
+            and self.allowlist == other.allowlist
+            and self.check_deliverability == other.check_deliverability
+        )
+
+    def __call__(self, value: str) -> None:
+        """
+        Validates an email address, then the deliverability of its domain when `check_deliverability` is on.
+
+        Args:
+            - value (str): The email address.
+
+        Raises:
+            - ValidationError: If the address is invalid, its domain isn't allowed or doesn't accept email.
+        """
+        super().__call__(value)
+        if self.check_deliverability:
+            domain = self.get_lookup_domain(value.rsplit('@', 1)[1])
+            if domain is not None and not self.get_resolver().is_deliverable(domain):
+                raise ValidationError(self.undeliverable_message, code=self.undeliverable_code, params={'value': value})
+
+    def get_resolver(self) -> CachedDomainResolver:
+        """
+        Returns the resolver checking the deliverability of domains.
+
+        Returns:
+            - CachedDomainResolver: The shared resolver configured by the settings.
+        """
+        return get_domain_resolver()
+
+    def get_lookup_domain(self, domain_part: str) -> Optional[str]:
+        """
+        Returns the domain to look up for a valid domain part.
+
+        Args:
+            - domain_part (str): The domain part of a valid email address.
+
+        Returns:
+            - str or None: The IDNA encoded domain, or None for literal IP addresses and `domain_allowlist` entries,
+              which aren't looked up.
+        """
+        if domain_part in self.domain_allowlist or self.literal_regex.match(domain_part):
+            return None
+        return normalize_domain(domain_part)
+
     def validate_domain_part(self, domain_part: str) -> bool:
         """
         Validates the domain part of the email address.
 
-        This method checks if the domain part of the email matches the allowed domain specified during initialization.
-        It handles both domain names and literal IP addresses.
+        This method checks if the domain part of the email matches one of the allowed domains specified during
+        initialization, in its IDNA encoded form. It handles both domain names and literal IP addresses, which must be
+        allowed as such, e.g. `10.0.0.1`.
 
         Args:
             - domain_part (str): The domain part of the email address to validate.
 
         Returns:
-            - bool: `True` if the domain part is valid and matches the allowed domain, `False` otherwise.
+            - bool: `True` if the domain part is valid and matches an allowed domain, `False` otherwise.
         """
-        if domain_part.lower() == self.allowed_domain.lower():
+        try:
+            domain = normalize_domain(domain_part)
+        except UnicodeError:
+            return False
+
+        if self.allowlist.matches_exact(domain):
             return True
 
-        if self.domain_regex.match(domain_part):
-            return domain_part.lower() == self.allowed_domain.lower()
+        if self.allowlist.matches_wildcard(domain):
+            return bool(self.domain_regex.match(domain))
 
         literal_match = self.literal_regex.match(domain_part)
-        if literal_match:
+        if literal_match and self.allowlist.matches_exact(literal_match[1].lower()):
             ip_address = literal_match[1]
             try:
-                self.validate_ipv46_address(ip_address)
+                validate_ipv46_address(ip_address)
                 return True
             except ValidationError:
                 ...
         return False
+
+    def iter_format_results(self, values: Iterable[str]) -> Iterator[Tuple[str, bool, Optional[str]]]:
+        """
+        Validates email addresses like `__call__` without the deliverability check, each distinct domain once.
+
+        Args:
+            - values (Iterable): The email addresses to validate, consumed lazily.
+
+        Returns:
+            - Iterator: Triples of address, whether it is valid, and the domain to look up as of `get_lookup_domain`.
+        """
+        # Resolve the lazily compiled pattern once instead of on every match
+        match_user = self.user_regex.match
+        domain_allowlist = self.domain_allowlist
+        domain_results = {}
+        for value in values:
+            if not value or '@' not in value or len(value) > 320:
+                yield value, False, None
+                continue
+
+            user_part, domain_part = value.rsplit('@', 1)
+            domain_result = domain_results.get(domain_part)
+            if domain_result is None:
+                valid_domain = domain_part in domain_allowlist or self.validate_domain_part(domain_part)
+                domain_result = (valid_domain, self.get_lookup_domain(domain_part) if valid_domain else None)
+                domain_results[domain_part] = domain_result
+            valid_domain, lookup_domain = domain_result
+            yield value, valid_domain and match_user(user_part) is not None, lookup_domain
+
+    def validate_many(self, values: Iterable[str], chunk_size: int = 1000) -> Iterator[Tuple[str, bool]]:
+        """
+        Validates email addresses in bulk, e.g. when importing users, without raising a `ValidationError` per failure.
+
+        The results are streamed in the order of the addresses, each distinct domain is checked once, and the user part
+        is matched against the compiled pattern directly. With `check_deliverability`, the addresses are read in chunks
+        whose new domains are looked up concurrently.
+
+        Args:
+            - values (Iterable): The email addresses to validate, consumed lazily.
+            - chunk_size (int, optional): The number of addresses read before looking their domains up. Defaults to
+              1000.
+
+        Returns:
+            - Iterator: Pairs of address and whether it is valid, as `__call__` would accept it.
+        """
+        results = self.iter_format_results(values)
+        if not self.check_deliverability:
+            for value, valid, _ in results:
+                yield value, valid
+            return
+
+        resolver = self.get_resolver()
+        while chunk := list(islice(results, chunk_size)):
+            deliverable = resolver.resolve_many(domain for _, valid, domain in chunk if valid and domain is not None)
+            for value, valid, domain in chunk:
+                yield value, valid and (domain is None or deliverable[domain])